@@ -11,10 +11,72 @@ LangGraph Comparison:
 - LangGraph: Explicit connections with StateGraph/Node/Edge
 """
 
+import argparse
+import asyncio
+from textwrap import dedent
+
 from crewai import Agent, Task, Crew
 
+from _common import cached_kickoff, default_llm, get_logger
 
-def main():
+logger = get_logger()
+
+# Prompt text is dedented once at import: indentation would otherwise be sent
+# to the LLM on every turn and shift the prompt prefix whenever code is reformatted.
+RESEARCHER_BACKSTORY = dedent("""\
+    You are an experienced research analyst with a keen eye
+    for detail. You excel at gathering information and presenting it
+    in a clear, structured manner.""").strip()
+
+RESEARCH_DESCRIPTION = dedent("""\
+    Research the current state of {topic}.
+    Focus on:
+    1. Main frameworks available
+    2. Key differences between them
+    3. Typical use cases""").strip()
+
+RESEARCH_EXPECTED_OUTPUT = dedent("""\
+    A structured report containing:
+    - List of major {topic}
+    - Comparison table of features
+    - Recommendations for different use cases""").strip()
+
+
+DEFAULT_TOPIC = "AI agent frameworks"
+
+
+def print_result(result):
+    """Show a CrewOutput and its main attributes."""
+    logger.info("\n" + "=" * 60)
+    logger.info("Result:")
+    logger.info("=" * 60)
+    logger.info(result)
+
+    # Check CrewOutput attributes
+    logger.info("\n" + "=" * 60)
+    logger.info("CrewOutput attributes:")
+    logger.info("=" * 60)
+    logger.info(f"Type: {type(result)}")
+    logger.info(f"Raw output: {result.raw[:200]}..." if len(result.raw) > 200 else f"Raw output: {result.raw}")
+
+    if result.tasks_output:
+        logger.info(f"\nTasks output count: {len(result.tasks_output)}")
+        for i, task_output in enumerate(result.tasks_output):
+            logger.info(f"  Task {i+1}: {type(task_output)}")
+
+    # Token usage (if available)
+    if hasattr(result, "token_usage"):
+        logger.info(f"\nToken usage: {result.token_usage}")
+
+
+def build_crew(stream: bool) -> Crew:
+    """
+    The quick start crew: one agent, one task.
+
+    Built once per topic: CrewAI accumulates token usage on the agent's LLM
+    (copies of a crew share the counters), so a crew reused across topics
+    would report the running total as each topic's token_usage.
+    """
     # Agent definition
     # role: Agent's role (included in system prompt to LLM)
     # goal: Agent's objective (guidance for task execution)
@@ -22,26 +84,18 @@ def main():
     researcher = Agent(
         role="Research Analyst",
         goal="Provide accurate and insightful analysis on given topics",
-        backstory="""You are an experienced research analyst with a keen eye
-        for detail. You excel at gathering information and presenting it
-        in a clear, structured manner.""",
+        backstory=RESEARCHER_BACKSTORY,
+        llm=default_llm(),  # LLM configured for prompt prefix caching
         verbose=True,  # Display execution process
     )
 
     # Task definition
-    # description: Detailed description of the task
+    # description: Detailed description of the task ({topic} is filled from inputs)
     # expected_output: Expected output format
     # agent: Agent that executes this task
     research_task = Task(
-        description="""Research the current state of AI agent frameworks.
-        Focus on:
-        1. Main frameworks available
-        2. Key differences between them
-        3. Typical use cases""",
-        expected_output="""A structured report containing:
-        - List of major AI agent frameworks
-        - Comparison table of features
-        - Recommendations for different use cases""",
+        description=RESEARCH_DESCRIPTION,
+        expected_output=RESEARCH_EXPECTED_OUTPUT,
         agent=researcher,
     )
 
@@ -52,35 +106,49 @@ def main():
         agents=[researcher],
         tasks=[research_task],
         verbose=True,  # Detailed log output
+        # Print output as it is generated (batch runs gather whole results,
+        # so they do not stream)
+        stream=stream,
     )
+    return crew
 
-    # Execute
-    print("=" * 60)
-    print("CrewAI Quick Start - Minimal Configuration")
-    print("=" * 60)
 
-    result = crew.kickoff()
+def main():
+    parser = argparse.ArgumentParser(description="CrewAI Quick Start")
+    parser.add_argument(
+        "--topic",
+        action="append",
+        help=f"Topic to research (default: {DEFAULT_TOPIC!r}); repeat for several topics",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Dispatch all topics together with kickoff_async",
+    )
+    args = parser.parse_args()
+    topics = args.topic or [DEFAULT_TOPIC]
 
-    print("\n" + "=" * 60)
-    print("Result:")
-    print("=" * 60)
-    print(result)
+    # Execute
+    logger.info("=" * 60)
+    logger.info("CrewAI Quick Start - Minimal Configuration")
+    logger.info("=" * 60)
 
-    # Check CrewOutput attributes
-    print("\n" + "=" * 60)
-    print("CrewOutput attributes:")
-    print("=" * 60)
-    print(f"Type: {type(result)}")
-    print(f"Raw output: {result.raw[:200]}..." if len(result.raw) > 200 else f"Raw output: {result.raw}")
+    if args.batch:
+        # All topics are dispatched together, each on its own crew (not
+        # kickoff_for_each_async, whose crew copies share one LLM's counters)
+        async def run_all():
+            return await asyncio.gather(
+                *(build_crew(stream=False).kickoff_async(inputs={"topic": t}) for t in topics)
+            )
 
-    if result.tasks_output:
-        print(f"\nTasks output count: {len(result.tasks_output)}")
-        for i, task_output in enumerate(result.tasks_output):
-            print(f"  Task {i+1}: {type(task_output)}")
+        results = asyncio.run(run_all())
+    else:
+        results = [cached_kickoff(build_crew(stream=True), inputs={"topic": t}) for t in topics]
 
-    # Token usage (if available)
-    if hasattr(result, "token_usage"):
-        print(f"\nToken usage: {result.token_usage}")
+    for topic, result in zip(topics, results):
+        if len(topics) > 1:
+            logger.info(f"\n[Topic] {topic}")
+        print_result(result)
 
 
 if __name__ == "__main__":
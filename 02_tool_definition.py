@@ -11,12 +11,27 @@ LangGraph Comparison:
 - Pydantic integration -> available via BaseTool
 """
 
+import argparse
+import functools
+import re
+from types import MappingProxyType
 from typing import Type
 
 from crewai import Agent, Task, Crew
-from crewai.tools import tool, BaseTool
+from crewai.tools import tool
 from pydantic import BaseModel, Field
 
+from _common import (
+    SchemaCachedTool,
+    cache_augmented_kickoff,
+    cached_kickoff,
+    default_llm,
+    get_logger,
+    sorted_tools,
+)
+
+logger = get_logger()
+
 
 # =============================================================================
 # Method 1: @tool decorator (simplest)
@@ -31,6 +46,13 @@ def simple_calculator(operation: str, a: float, b: float) -> str:
         a: First number
         b: Second number
     """
+    return _calculate(operation, a, b)
+
+
+# Tool bodies below are pure functions of their arguments, so the work is done
+# in lru_cache'd helpers: @tool wraps the public function, not the helper.
+@functools.lru_cache(maxsize=256)
+def _calculate(operation: str, a: float, b: float) -> str:
     operations = {
         "add": a + b,
         "subtract": a - b,
@@ -51,14 +73,21 @@ def weather_lookup(city: str, unit: str = "celsius") -> str:
 
     This is a mock implementation for demonstration.
     """
-    # Mock weather data
-    mock_weather = {
-        "Tokyo": {"temp_c": 22, "condition": "Sunny"},
-        "New York": {"temp_c": 18, "condition": "Cloudy"},
-        "London": {"temp_c": 15, "condition": "Rainy"},
-    }
+    return _lookup_weather(city, unit)
+
+
+# Mock weather data (read-only, built once at import)
+_MOCK_WEATHER = MappingProxyType({
+    "Tokyo": MappingProxyType({"temp_c": 22, "condition": "Sunny"}),
+    "New York": MappingProxyType({"temp_c": 18, "condition": "Cloudy"}),
+    "London": MappingProxyType({"temp_c": 15, "condition": "Rainy"}),
+})
+_UNKNOWN_WEATHER = MappingProxyType({"temp_c": 20, "condition": "Unknown"})
+
 
-    weather = mock_weather.get(city, {"temp_c": 20, "condition": "Unknown"})
+@functools.lru_cache(maxsize=256)
+def _lookup_weather(city: str, unit: str) -> str:
+    weather = _MOCK_WEATHER.get(city, _UNKNOWN_WEATHER)
     temp = weather["temp_c"]
 
     if unit == "fahrenheit":
@@ -73,6 +102,8 @@ def weather_lookup(city: str, unit: str = "celsius") -> str:
 # =============================================================================
 # Method 3: BaseTool class inheritance (most flexible)
 # =============================================================================
+# SchemaCachedTool (see _common.py) is a thin BaseTool subclass that also
+# caches the rendered args_schema JSON.
 class DatabaseQueryInput(BaseModel):
     """Input schema for database query tool."""
 
@@ -81,7 +112,7 @@ class DatabaseQueryInput(BaseModel):
     limit: int = Field(default=10, description="Maximum number of rows to return")
 
 
-class DatabaseQueryTool(BaseTool):
+class DatabaseQueryTool(SchemaCachedTool):
     """Tool for querying a mock database."""
 
     name: str = "Database Query"
@@ -90,88 +121,155 @@ class DatabaseQueryTool(BaseTool):
 
     def _run(self, table: str, columns: str = "*", limit: int = 10) -> str:
         """Execute the database query."""
-        # Mock database
-        mock_data = {
-            "users": [
-                {"id": 1, "name": "Alice", "email": "alice@example.com"},
-                {"id": 2, "name": "Bob", "email": "bob@example.com"},
-                {"id": 3, "name": "Charlie", "email": "charlie@example.com"},
-            ],
-            "products": [
-                {"id": 1, "name": "Widget", "price": 9.99},
-                {"id": 2, "name": "Gadget", "price": 19.99},
-            ],
-        }
+        return _query_mock_db(table, columns, limit)
+
+
+# Mock database (read-only, built once at import)
+_MOCK_DB = MappingProxyType({
+    "users": (
+        MappingProxyType({"id": 1, "name": "Alice", "email": "alice@example.com"}),
+        MappingProxyType({"id": 2, "name": "Bob", "email": "bob@example.com"}),
+        MappingProxyType({"id": 3, "name": "Charlie", "email": "charlie@example.com"}),
+    ),
+    "products": (
+        MappingProxyType({"id": 1, "name": "Widget", "price": 9.99}),
+        MappingProxyType({"id": 2, "name": "Gadget", "price": 19.99}),
+    ),
+})
 
-        if table not in mock_data:
-            return f"Error: Table '{table}' not found"
 
-        data = mock_data[table][:limit]
+_split_columns = re.compile(r"\s*,\s*").split
 
-        if columns != "*":
-            col_list = [c.strip() for c in columns.split(",")]
-            data = [{k: v for k, v in row.items() if k in col_list} for row in data]
 
-        return f"Query result from {table}:\n{data}"
+@functools.cache
+def _parse_columns(columns: str) -> frozenset[str]:
+    """Parse a comma-separated column list into a set of column names."""
+    return frozenset(_split_columns(columns.strip()))
+
+
+@functools.lru_cache(maxsize=256)
+def _query_mock_db(table: str, columns: str, limit: int) -> str:
+    if table not in _MOCK_DB:
+        return f"Error: Table '{table}' not found"
+
+    rows = _MOCK_DB[table][:limit]
+
+    if columns == "*":
+        data = [dict(row) for row in rows]
+    else:
+        col_set = _parse_columns(columns)
+        # Rows of a table share their keys: pick the selected ones once,
+        # keeping the table's column order
+        selected = [k for k in rows[0] if k in col_set] if rows else []
+        data = [{k: row[k] for k in selected} for row in rows]
+
+    return f"Query result from {table}:\n{data}"
 
 
 def main():
-    # Instantiate all tools
-    tools = [
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--cag",
+        action="store_true",
+        help="Run the tools directly and answer in a single LLM call (no ReAct loop)",
+    )
+    args = parser.parse_args()
+
+    # Instantiate all tools (sorted by name to keep the prompt prefix stable)
+    database_tool = DatabaseQueryTool()
+    tools = sorted_tools(
         simple_calculator,
         weather_lookup,
-        DatabaseQueryTool(),
-    ]
+        database_tool,
+    )
 
     # Display tool information
-    print("=" * 60)
-    print("Tool Definition Comparison")
-    print("=" * 60)
+    logger.info("=" * 60)
+    logger.info("Tool Definition Comparison")
+    logger.info("=" * 60)
 
     for t in tools:
-        print(f"\nTool: {t.name}")
-        print(f"  Description: {t.description[:80]}...")
-        print(f"  Type: {type(t).__name__}")
-        if hasattr(t, "args_schema") and t.args_schema:
-            print(f"  Args Schema: {t.args_schema.model_json_schema()}")
-
-    # Agent with tools
-    analyst = Agent(
-        role="Data Analyst",
-        goal="Analyze data using available tools",
-        backstory="You are a skilled analyst who uses tools efficiently.",
-        tools=tools,
-        verbose=True,
+        logger.info(f"\nTool: {t.name}")
+        logger.info(f"  Description: {t.description[:80]}...")
+        logger.info(f"  Type: {type(t).__name__}")
+        if isinstance(t, SchemaCachedTool):
+            logger.info(f"  Args Schema: {t.cached_schema}")
+        elif hasattr(t, "args_schema") and t.args_schema:
+            logger.info(f"  Args Schema: {t.args_schema.model_json_schema()}")
+
+    # Agents with tools
+    # One agent per concurrent task: an Agent holds a single executor, so
+    # async tasks should not share one.
+    def make_analyst(*agent_tools):
+        return Agent(
+            role="Data Analyst",
+            goal="Analyze data using available tools",
+            backstory="You are a skilled analyst who uses tools efficiently.",
+            tools=sorted_tools(*agent_tools),
+            llm=default_llm(),
+            verbose=True,
+        )
+
+    calculator_analyst = make_analyst(simple_calculator)
+    weather_analyst = make_analyst(weather_lookup)
+    database_analyst = make_analyst(database_tool)
+    summary_analyst = make_analyst()
+
+    # The three lookups are independent, so they run concurrently
+    # (async_execution=True); the summary task waits for all of them via context.
+    calculation_task = Task(
+        description="Calculate 15 * 7 using the calculator.",
+        expected_output="The result of the calculation",
+        agent=calculator_analyst,
+        async_execution=True,
     )
-
-    # Task that requires tool usage
-    analysis_task = Task(
-        description="""Perform the following analysis:
-        1. Calculate 15 * 7 using the calculator
-        2. Get the weather in Tokyo
-        3. Query the users table from the database
-
-        Summarize all results.""",
+    weather_task = Task(
+        description="Get the weather in Tokyo.",
+        expected_output="The current weather in Tokyo",
+        agent=weather_analyst,
+        async_execution=True,
+    )
+    query_task = Task(
+        description="Query the users table from the database.",
+        expected_output="The rows returned from the users table",
+        agent=database_analyst,
+        async_execution=True,
+    )
+    summary_task = Task(
+        description="Summarize the results of the calculation, weather and database tasks.",
         expected_output="A summary of all tool results",
-        agent=analyst,
+        agent=summary_analyst,
+        context=[calculation_task, weather_task, query_task],
     )
 
     crew = Crew(
-        agents=[analyst],
-        tasks=[analysis_task],
+        agents=[calculator_analyst, weather_analyst, database_analyst, summary_analyst],
+        tasks=[calculation_task, weather_task, query_task, summary_task],
         verbose=True,
+        stream=True,  # Print output as it is generated
     )
 
-    print("\n" + "=" * 60)
-    print("Executing Crew with Tools")
-    print("=" * 60)
-
-    result = crew.kickoff()
+    logger.info("\n" + "=" * 60)
+    logger.info("Executing Crew with Tools")
+    logger.info("=" * 60)
+
+    if args.cag:
+        # Every lookup the tasks ask for is known up front
+        result = cache_augmented_kickoff(
+            crew,
+            [
+                (simple_calculator, {"operation": "multiply", "a": 15, "b": 7}),
+                (weather_lookup, {"city": "Tokyo"}),
+                (database_tool, {"table": "users"}),
+            ],
+        )
+    else:
+        result = cached_kickoff(crew)
 
-    print("\n" + "=" * 60)
-    print("Result:")
-    print("=" * 60)
-    print(result)
+    logger.info("\n" + "=" * 60)
+    logger.info("Result:")
+    logger.info("=" * 60)
+    logger.info(result)
 
 
 if __name__ == "__main__":
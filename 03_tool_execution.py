@@ -11,14 +11,34 @@ LangGraph Comparison:
 - CrewAI agents autonomously decide when to use tools
 """
 
+import argparse
+import asyncio
 import time
 from datetime import datetime
+from textwrap import dedent
 from typing import Type
 
 from crewai import Agent, Task, Crew
-from crewai.tools import tool, BaseTool
+from crewai.tools import tool
 from pydantic import BaseModel, Field
 
+from _common import (
+    SchemaCachedTool,
+    cache_augmented_kickoff,
+    cached_kickoff,
+    default_llm,
+    get_logger,
+)
+
+logger = get_logger()
+
+# Prompt text (dedented once at import)
+REPORT_EXPECTED_OUTPUT = dedent("""\
+    A report showing:
+    - Timestamp result
+    - Slow API call result
+    - Advanced search result""").strip()
+
 
 # =============================================================================
 # Simple tool
@@ -27,24 +47,43 @@ from pydantic import BaseModel, Field
 def get_timestamp() -> str:
     """Get current timestamp. Each call returns a different value."""
     timestamp = datetime.now().isoformat()
-    print(f"  [Tool Executed] get_timestamp() -> {timestamp}")
+    logger.info(f"  [Tool Executed] get_timestamp() -> {timestamp}")
     return f"Current timestamp: {timestamp}"
 
 
 # =============================================================================
 # Tool that simulates a slow API
 # =============================================================================
+# Unlike get_timestamp, the slow tools are pure functions of their arguments:
+# repeat calls (e.g. agent retries) are served from the cache without the delay.
+# "[Tool Executed]" is only printed on a cache miss.
+# The tools are coroutines, so results are memoized in plain dicts: lru_cache
+# would cache the coroutine object, which can only be awaited once.
+# Keys are normalized queries; the cached values hold the result data, and
+# each reply quotes the query as the caller wrote it.
+_api_results: dict[str, str] = {}  # normalized query -> retrieval time
+_search_results: dict[tuple[str, int], str] = {}  # (normalized query, max_results) -> summary
+
+
+def _normalize_query(query: str) -> str:
+    """Cache key for a query: case and whitespace folded, so trivially reworded queries share an entry."""
+    return " ".join(query.casefold().split())
+
+
 @tool("Slow API Call")
-def slow_api_call(query: str) -> str:
+async def slow_api_call(query: str) -> str:
     """
     Simulate a slow API call.
 
     Args:
         query: The search query
     """
-    print(f"  [Tool Executed] slow_api_call('{query}') - Simulating 1 second delay...")
-    time.sleep(1)  # Simulate slow API
-    return f"API Result for '{query}': Sample data retrieved at {datetime.now().isoformat()}"
+    key = _normalize_query(query)
+    if key not in _api_results:
+        logger.info(f"  [Tool Executed] slow_api_call('{query}') - Simulating 1 second delay...")
+        await asyncio.sleep(1)  # Simulate slow API without blocking other pending calls
+        _api_results[key] = datetime.now().isoformat()
+    return f"API Result for '{query}': Sample data retrieved at {_api_results[key]}"
 
 
 # =============================================================================
@@ -57,80 +96,143 @@ class SearchInput(BaseModel):
     max_results: int = Field(default=10, description="Maximum results to return")
 
 
-class SearchTool(BaseTool):
+class SearchTool(SchemaCachedTool):
     """Search tool with multiple parameters."""
 
     name: str = "Advanced Search"
     description: str = "Search with advanced options including result limit."
     args_schema: Type[BaseModel] = SearchInput
 
-    def _run(self, query: str, max_results: int = 10) -> str:
-        print(f"  [Tool Executed] SearchTool('{query}', max_results={max_results})")
-        time.sleep(0.5)  # Simulate processing
-        return f"Search result for '{query}': Found {max_results} items (limited)"
+    # CrewAI's BaseTool.run() drives a coroutine _run to completion, so the
+    # tool still works from the synchronous agent loop.
+    async def _run(self, query: str, max_results: int = 10) -> str:
+        key = (_normalize_query(query), max_results)
+        if key not in _search_results:
+            logger.info(f"  [Tool Executed] SearchTool('{query}', max_results={max_results})")
+            await asyncio.sleep(0.5)  # Simulate processing
+            _search_results[key] = f"Found {max_results} items (limited)"
+        return f"Search result for '{query}': {_search_results[key]}"
+
+
+async def demo_concurrent_tools():
+    """Run two searches concurrently: elapsed time is ~max(delays), not the sum."""
+    search = SearchTool()
+    start_time = time.time()
+    await asyncio.gather(
+        search._run("concurrency demo: first", max_results=3),
+        search._run("concurrency demo: second", max_results=3),
+    )
+    return time.time() - start_time
 
 
 def main():
-    print("=" * 60)
-    print("Tool Execution Test")
-    print("=" * 60)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--cag",
+        action="store_true",
+        help="Run the tools directly and answer in a single LLM call (no ReAct loop)",
+    )
+    args = parser.parse_args()
 
+    logger.info("=" * 60)
+    logger.info("Tool Execution Test")
+    logger.info("=" * 60)
+
+    search_tool = SearchTool()
     tools = [
         get_timestamp,
         slow_api_call,
-        SearchTool(),
+        search_tool,
     ]
 
     # Display tool info
-    print("\nAvailable Tools:")
+    logger.info("\nAvailable Tools:")
     for t in tools:
-        print(f"  - {t.name}: {type(t).__name__}")
-
-    analyst = Agent(
-        role="Tool Tester",
-        goal="Test tool execution by calling various tools",
-        backstory="You test tools methodically and report results.",
-        tools=tools,
-        verbose=True,
+        logger.info(f"  - {t.name}: {type(t).__name__}")
+
+    # Async tool bodies overlap when awaited together
+    elapsed = asyncio.run(demo_concurrent_tools())
+    logger.info(f"\nTwo concurrent SearchTool calls (0.5s each) took {elapsed:.2f}s")
+
+    # One agent per concurrent task: an Agent holds a single executor, so
+    # async tasks should not share one.
+    def make_tester(*agent_tools):
+        return Agent(
+            role="Tool Tester",
+            goal="Test tool execution by calling various tools",
+            backstory="You test tools methodically and report results.",
+            tools=list(agent_tools),
+            llm=default_llm(),
+            verbose=True,
+        )
+
+    timestamp_tester = make_tester(get_timestamp)
+    api_tester = make_tester(slow_api_call)
+    search_tester = make_tester(search_tool)
+    reporter = make_tester()
+
+    # Tasks designed to test tool execution
+    # The three tool calls are independent, so they run concurrently
+    # (async_execution=True): wall time is the slowest call, not the sum.
+    timestamp_task = Task(
+        description="Call get_timestamp to get the current time.",
+        expected_output="Timestamp result",
+        agent=timestamp_tester,
+        async_execution=True,
     )
-
-    # Task designed to test tool execution
-    test_task = Task(
-        description="""Test tool execution:
-        1. Call get_timestamp to get current time
-        2. Call slow_api_call with query "AI agents"
-        3. Call advanced_search with query "machine learning" and max_results=5
-
-        Report all results.""",
-        expected_output="""A report showing:
-        - Timestamp result
-        - Slow API call result
-        - Advanced search result""",
-        agent=analyst,
+    api_task = Task(
+        description='Call slow_api_call with query "AI agents".',
+        expected_output="Slow API call result",
+        agent=api_tester,
+        async_execution=True,
+    )
+    search_task = Task(
+        description='Call advanced_search with query "machine learning" and max_results=5.',
+        expected_output="Advanced search result",
+        agent=search_tester,
+        async_execution=True,
+    )
+    report_task = Task(
+        description="Report the results of all tool executions.",
+        expected_output=REPORT_EXPECTED_OUTPUT,
+        agent=reporter,
+        context=[timestamp_task, api_task, search_task],
     )
 
     crew = Crew(
-        agents=[analyst],
-        tasks=[test_task],
+        agents=[timestamp_tester, api_tester, search_tester, reporter],
+        tasks=[timestamp_task, api_task, search_task, report_task],
         verbose=True,
+        stream=True,  # Print output as it is generated
     )
 
-    print("\n" + "=" * 60)
-    print("Executing Tool Test")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("Executing Tool Test")
+    logger.info("=" * 60)
 
     start_time = time.time()
-    result = crew.kickoff()
+    if args.cag:
+        # Every tool call the tasks ask for is known up front
+        result = cache_augmented_kickoff(
+            crew,
+            [
+                (get_timestamp, {}),
+                (slow_api_call, {"query": "AI agents"}),
+                (search_tool, {"query": "machine learning", "max_results": 5}),
+            ],
+        )
+    else:
+        result = cached_kickoff(crew, cache=False)  # Timestamps and timings must be from this run
     elapsed = time.time() - start_time
 
-    print("\n" + "=" * 60)
-    print(f"Result (Total time: {elapsed:.2f}s):")
-    print("=" * 60)
-    print(result)
+    logger.info("\n" + "=" * 60)
+    logger.info(f"Result (Total time: {elapsed:.2f}s):")
+    logger.info("=" * 60)
+    logger.info(result)
 
     # Check token usage if available
     if hasattr(result, "token_usage"):
-        print(f"\nToken usage: {result.token_usage}")
+        logger.info(f"\nToken usage: {result.token_usage}")
 
 
 if __name__ == "__main__":
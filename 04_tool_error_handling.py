@@ -11,11 +11,39 @@ LangGraph Comparison:
 - CrewAI: Errors are automatically propagated to the agent
 """
 
+import functools
+from contextvars import ContextVar, copy_context
+from textwrap import dedent
 from typing import Type
 
 from crewai import Agent, Task, Crew
-from crewai.tools import tool, BaseTool
-from pydantic import BaseModel, Field
+from crewai.tools import tool
+from pydantic import BaseModel, Field, model_validator
+
+from _common import SchemaCachedTool, cached_kickoff, default_llm, get_logger, sorted_tools
+
+logger = get_logger()
+
+# Prompt text (dedented once at import)
+ERROR_HANDLER_BACKSTORY = dedent("""\
+    You are an expert at testing error handling.
+    You intentionally trigger errors to verify system robustness.
+    When a tool fails, you analyze the error and try alternative approaches.""").strip()
+
+ERROR_TEST_DESCRIPTION = dedent("""\
+    Test error handling by:
+    1. Use the Safe Division tool to divide 10 by 0 (should return error message)
+    2. Use the Safe Division tool to divide 10 by 2 (should succeed)
+    3. Use the Flaky Tool with operation "test" (may fail first, retry should succeed)
+    4. Try the Failing Tool with should_fail=True, then with should_fail=False
+
+    Report what errors occurred and how they were handled.""").strip()
+
+ERROR_TEST_EXPECTED_OUTPUT = dedent("""\
+    A report containing:
+    - Each error encountered
+    - How the agent recovered or handled the error
+    - Final successful results where applicable""").strip()
 
 
 # =============================================================================
@@ -37,7 +65,9 @@ def failing_tool(should_fail: bool = True) -> str:
 # =============================================================================
 # Tool that conditionally fails (for retry testing)
 # =============================================================================
-call_counter = {"count": 0}
+# Call count lives in a ContextVar rather than a module-level dict, so crews
+# run in separate contexts (e.g. in parallel) each get their own first failure.
+_flaky_calls: ContextVar[int] = ContextVar("flaky_calls", default=0)
 
 
 @tool("Flaky Tool")
@@ -49,13 +79,14 @@ def flaky_tool(operation: str) -> str:
     Args:
         operation: The operation to perform
     """
-    call_counter["count"] += 1
-    print(f"  [Flaky Tool] Call #{call_counter['count']} for operation: {operation}")
+    count = _flaky_calls.get() + 1
+    _flaky_calls.set(count)
+    logger.info(f"  [Flaky Tool] Call #{count} for operation: {operation}")
 
-    if call_counter["count"] == 1:
+    if count == 1:
         raise ConnectionError("Simulated network error on first attempt!")
 
-    return f"Operation '{operation}' completed successfully on attempt #{call_counter['count']}"
+    return f"Operation '{operation}' completed successfully on attempt #{count}"
 
 
 # =============================================================================
@@ -67,8 +98,18 @@ class DivisionInput(BaseModel):
     dividend: float = Field(..., description="Number to be divided")
     divisor: float = Field(..., description="Number to divide by")
 
+    @model_validator(mode="before")
+    @classmethod
+    def _reject_zero_divisor(cls, data):
+        # Runs on the raw arguments, before field coercion: the zero-divisor
+        # case fails in argument validation and never reaches _run.
+        # CrewAI reports the validation error back to the agent as the tool result.
+        if isinstance(data, dict) and data.get("divisor") in (0, "0"):
+            raise ValueError("Division by zero is not allowed. Please provide a non-zero divisor.")
+        return data
+
 
-class SafeDivisionTool(BaseTool):
+class SafeDivisionTool(SchemaCachedTool):
     """A division tool that returns error messages instead of raising exceptions."""
 
     name: str = "Safe Division"
@@ -76,13 +117,20 @@ class SafeDivisionTool(BaseTool):
     args_schema: Type[BaseModel] = DivisionInput
 
     def _run(self, dividend: float, divisor: float) -> str:
-        print(f"  [Safe Division] {dividend} / {divisor}")
+        return _safe_divide(dividend, divisor)
+
 
-        if divisor == 0:
-            return "Error: Division by zero is not allowed. Please provide a non-zero divisor."
+# Pure function of its arguments: retries with the same operands hit the cache.
+# Stateful tools (flaky_tool) are deliberately not cached.
+@functools.lru_cache(maxsize=256)
+def _safe_divide(dividend: float, divisor: float) -> str:
+    logger.info(f"  [Safe Division] {dividend} / {divisor}")
 
-        result = dividend / divisor
-        return f"{dividend} / {divisor} = {result}"
+    if divisor == 0:
+        return "Error: Division by zero is not allowed. Please provide a non-zero divisor."
+
+    result = dividend / divisor
+    return f"{dividend} / {divisor} = {result}"
 
 
 # =============================================================================
@@ -94,7 +142,7 @@ class StrictInput(BaseModel):
     value: int = Field(..., ge=0, le=100, description="A value between 0 and 100")
 
 
-class StrictValidationTool(BaseTool):
+class StrictValidationTool(SchemaCachedTool):
     """Tool with strict input validation."""
 
     name: str = "Strict Validator"
@@ -106,45 +154,36 @@ class StrictValidationTool(BaseTool):
 
 
 def main():
-    print("=" * 60)
-    print("Tool Error Handling Test")
-    print("=" * 60)
+    logger.info("=" * 60)
+    logger.info("Tool Error Handling Test")
+    logger.info("=" * 60)
 
-    # Reset counter
-    call_counter["count"] = 0
+    # Fresh context for this run: the flaky tool's call count starts at 0
+    ctx = copy_context()
+    ctx.run(_flaky_calls.set, 0)
 
-    tools = [
+    tools = sorted_tools(
         failing_tool,
         flaky_tool,
         SafeDivisionTool(),
         StrictValidationTool(),
-    ]
+    )
 
     # Error handling specialist agent
     error_handler = Agent(
         role="Error Handling Specialist",
         goal="Test various error scenarios and observe how errors are handled",
-        backstory="""You are an expert at testing error handling.
-        You intentionally trigger errors to verify system robustness.
-        When a tool fails, you analyze the error and try alternative approaches.""",
+        backstory=ERROR_HANDLER_BACKSTORY,
         tools=tools,
+        llm=default_llm(),
         verbose=True,
         max_retry_limit=3,  # Allow retries on failure
     )
 
     # Task designed to trigger various error conditions
     error_test_task = Task(
-        description="""Test error handling by:
-        1. Use the Safe Division tool to divide 10 by 0 (should return error message)
-        2. Use the Safe Division tool to divide 10 by 2 (should succeed)
-        3. Use the Flaky Tool with operation "test" (may fail first, retry should succeed)
-        4. Try the Failing Tool with should_fail=True, then with should_fail=False
-
-        Report what errors occurred and how they were handled.""",
-        expected_output="""A report containing:
-        - Each error encountered
-        - How the agent recovered or handled the error
-        - Final successful results where applicable""",
+        description=ERROR_TEST_DESCRIPTION,
+        expected_output=ERROR_TEST_EXPECTED_OUTPUT,
         agent=error_handler,
     )
 
@@ -152,27 +191,30 @@ def main():
         agents=[error_handler],
         tasks=[error_test_task],
         verbose=True,
+        # Not streamed: a streaming crew runs kickoff in its own thread, outside
+        # ctx, and the flaky tool's call count would not be seen here
     )
 
-    print("\n" + "=" * 60)
-    print("Executing Error Handling Test")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("Executing Error Handling Test")
+    logger.info("=" * 60)
 
     try:
-        result = crew.kickoff()
+        # Never replayed: the point is to watch the tools fail and recover
+        result = ctx.run(cached_kickoff, crew, cache=False)
 
-        print("\n" + "=" * 60)
-        print("Result:")
-        print("=" * 60)
-        print(result)
+        logger.info("\n" + "=" * 60)
+        logger.info("Result:")
+        logger.info("=" * 60)
+        logger.info(result)
 
     except Exception as e:
-        print("\n" + "=" * 60)
-        print(f"Crew execution failed with error: {type(e).__name__}")
-        print("=" * 60)
-        print(f"Error message: {e}")
+        logger.info("\n" + "=" * 60)
+        logger.info(f"Crew execution failed with error: {type(e).__name__}")
+        logger.info("=" * 60)
+        logger.info(f"Error message: {e}")
 
-    print(f"\n[Debug] Flaky tool was called {call_counter['count']} times")
+    logger.info(f"\n[Debug] Flaky tool was called {ctx[_flaky_calls]} times")
 
 
 if __name__ == "__main__":
@@ -11,9 +11,34 @@ LangGraph Comparison:
 - CrewAI: human_input flag at task level (simpler)
 """
 
+from textwrap import dedent
+
 from crewai import Agent, Task, Crew
 from crewai.tools import tool
 
+from _common import cached_kickoff, default_llm, get_logger
+
+logger = get_logger()
+
+# Prompt text (dedented once at import)
+WRITER_BACKSTORY = dedent("""\
+    You are a professional content writer who values
+    collaboration. You create drafts and refine them based on feedback.""").strip()
+
+EDITOR_BACKSTORY = dedent("""\
+    You are a meticulous editor who ensures content
+    meets high standards before publication.""").strip()
+
+WRITING_DESCRIPTION = dedent("""\
+    Create a draft document about "Best Practices for AI Agent Development".
+    Use the draft generator tool to create an initial draft.
+    The document should be professional and informative.""").strip()
+
+EDITING_DESCRIPTION = dedent("""\
+    Review and improve the draft from the writing task.
+    Incorporate any feedback provided during the review.
+    Ensure the final version is polished and professional.""").strip()
+
 
 @tool("Draft Generator")
 def generate_draft(topic: str) -> str:
@@ -43,10 +68,10 @@ In summary, {topic} is a significant area that requires attention.
 
 
 def main():
-    print("=" * 60)
-    print("HITL: Task-level human_input Test")
-    print("=" * 60)
-    print("""
+    logger.info("=" * 60)
+    logger.info("HITL: Task-level human_input Test")
+    logger.info("=" * 60)
+    logger.info("""
 This example demonstrates human_input=True on a Task.
 When enabled, the agent will pause and ask for human feedback
 before finalizing the task output.
@@ -60,9 +85,9 @@ LangGraph Comparison:
     writer = Agent(
         role="Content Writer",
         goal="Create high-quality content based on user requirements",
-        backstory="""You are a professional content writer who values
-        collaboration. You create drafts and refine them based on feedback.""",
+        backstory=WRITER_BACKSTORY,
         tools=[generate_draft],
+        llm=default_llm(),
         verbose=True,
     )
 
@@ -70,16 +95,14 @@ LangGraph Comparison:
     editor = Agent(
         role="Content Editor",
         goal="Review and improve content quality",
-        backstory="""You are a meticulous editor who ensures content
-        meets high standards before publication.""",
+        backstory=EDITOR_BACKSTORY,
+        llm=default_llm(),
         verbose=True,
     )
 
     # Task WITH human_input - will pause for feedback
     writing_task = Task(
-        description="""Create a draft document about "Best Practices for AI Agent Development".
-        Use the draft generator tool to create an initial draft.
-        The document should be professional and informative.""",
+        description=WRITING_DESCRIPTION,
         expected_output="A well-structured draft document ready for review",
         agent=writer,
         human_input=True,  # <-- This enables HITL
@@ -87,9 +110,7 @@ LangGraph Comparison:
 
     # Follow-up task
     editing_task = Task(
-        description="""Review and improve the draft from the writing task.
-        Incorporate any feedback provided during the review.
-        Ensure the final version is polished and professional.""",
+        description=EDITING_DESCRIPTION,
         expected_output="A final, polished document incorporating all feedback",
         agent=editor,
     )
@@ -98,24 +119,25 @@ LangGraph Comparison:
         agents=[writer, editor],
         tasks=[writing_task, editing_task],
         verbose=True,
+        stream=True,  # Print output as it is generated
     )
 
-    print("\n" + "=" * 60)
-    print("Starting Crew Execution")
-    print("=" * 60)
-    print("""
+    logger.info("\n" + "=" * 60)
+    logger.info("Starting Crew Execution")
+    logger.info("=" * 60)
+    logger.info("""
 NOTE: When the writing task completes, you will be prompted
 for feedback. This is the human_input=True feature in action.
 
 Type your feedback when prompted, or press Enter to accept.
 """)
 
-    result = crew.kickoff()
+    result = cached_kickoff(crew)
 
-    print("\n" + "=" * 60)
-    print("Final Result:")
-    print("=" * 60)
-    print(result)
+    logger.info("\n" + "=" * 60)
+    logger.info("Final Result:")
+    logger.info("=" * 60)
+    logger.info(result)
 
 
 if __name__ == "__main__":
@@ -13,13 +13,76 @@ LangGraph Comparison:
 Note: CrewAI Flow is a relatively new feature, API may change
 """
 
+import argparse
+import asyncio
+
 from crewai.flow.flow import Flow, listen, start, router
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+
+# Console separators
+_BAR = "=" * 60
+_HALFBAR = "-" * 60
+
+
+# Draft scaffolds (filled with format_map on each generate/revise)
+_PROPOSAL_TEMPLATE = """
+Proposal: {topic}
+============================
+
+Executive Summary:
+This proposal outlines a comprehensive approach to {topic}.
+
+Objectives:
+1. Primary goal related to {topic}
+2. Secondary objectives
+3. Success metrics
+
+Timeline:
+- Phase 1: Planning and Research
+- Phase 2: Implementation
+- Phase 3: Review and Iteration
+
+Budget Estimate:
+[To be determined based on scope]
+
+Revision #{rev}
+"""
+
+_REVISED_TEMPLATE = """
+Proposal: {topic}
+============================
+[REVISED based on feedback: {feedback}]
+
+Executive Summary:
+This revised proposal addresses the feedback provided.
+
+Objectives (Updated):
+1. Refined goal based on reviewer feedback
+2. Additional considerations
+3. Updated success metrics
+
+Timeline (Adjusted):
+- Phase 1: Extended planning
+- Phase 2: Implementation with checkpoints
+- Phase 3: Comprehensive review
+
+Budget Estimate:
+[Updated based on revised scope]
+
+Revision #{rev}
+"""
+
+
+# Review outcome -> next route (anything else, i.e. feedback, means "revise")
+_ROUTE_TABLE = {"approved": "finalize", "rejected": "handle_rejection"}
 
 
 class ProposalState(BaseModel):
     """State for the proposal workflow."""
 
+    model_config = ConfigDict(validate_assignment=False)
+
     topic: str = "AI Agent Framework Adoption"  # Set default value
     draft: str = ""
     feedback: str = ""
@@ -32,62 +95,76 @@ class ProposalFlow(Flow[ProposalState]):
     A flow that demonstrates human feedback integration.
 
     Flow structure:
-    1. generate_proposal -> draft created
+    1. generate_proposal -> draft created, routes to "review"
     2. review_proposal -> human reviews and provides feedback
     3. Based on feedback:
        - If approved -> finalize
-       - If rejected -> revise (up to 3 times)
-    """
+       - If rejected -> handle_rejection
+       - Otherwise -> revise, which routes back to review (up to 3 times)
 
-    @start()
-    def generate_proposal(self):
-        """Generate initial proposal."""
-        print(f"\n[Flow] Generating proposal for: {self.state.topic}")
+    Every review round is reached through the "review" route. A listener
+    on or_(generate_proposal, "review") would fire only once per run, so
+    the flow would stop after the first revision.
 
-        self.state.draft = f"""
-Proposal: {self.state.topic}
-============================
+    The review step does not block on input(): it emits an "input_required"
+    event and awaits a future that submit_feedback() resolves, so the event
+    loop stays free while the human decides. Consume the events with
+    stream_events().
+    """
 
-Executive Summary:
-This proposal outlines a comprehensive approach to {self.state.topic}.
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._pending_input: asyncio.Future | None = None
 
-Objectives:
-1. Primary goal related to {self.state.topic}
-2. Secondary objectives
-3. Success metrics
+    def submit_feedback(self, text: str):
+        """Resume the waiting review step with the reviewer's feedback."""
+        self._pending_input.set_result(text)
 
-Timeline:
-- Phase 1: Planning and Research
-- Phase 2: Implementation
-- Phase 3: Review and Iteration
+    async def stream_events(self):
+        """
+        Run the flow and yield its events until it finishes.
 
-Budget Estimate:
-[To be determined based on scope]
+        Yields {"type": "input_required", "draft": ...} whenever a review is
+        pending (answer with submit_feedback()), then a final
+        {"type": "finished", "result": ...}.
+        """
+        kickoff = asyncio.ensure_future(self.kickoff_async())
+        while True:
+            next_event = asyncio.ensure_future(self._events.get())
+            await asyncio.wait({kickoff, next_event}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event.done():
+                yield next_event.result()
+            else:
+                next_event.cancel()
+                yield {"type": "finished", "result": kickoff.result()}
+                return
 
-Revision #{self.state.revision_count}
-"""
+    @start()
+    def generate_proposal(self):
+        """Generate initial proposal."""
+        print(f"\n[Flow] Generating proposal for: {self.state.topic}")
+
+        self.state.draft = _PROPOSAL_TEMPLATE.format_map(
+            {"topic": self.state.topic, "rev": self.state.revision_count}
+        )
         print(f"[Flow] Draft generated (revision {self.state.revision_count})")
 
-    @listen(generate_proposal)
-    def review_proposal(self):
+    @router(generate_proposal)
+    def request_review(self):
+        """Send the first draft to review, the same route revisions take."""
+        return "review"
+
+    @listen("review")
+    async def review_proposal(self):
         """
         Human review step.
-        In production, this would integrate with a UI or notification system.
+        Emits an input request and suspends until feedback is submitted; the
+        consumer of stream_events() can be a console, a UI or a notification system.
         """
-        print("\n" + "=" * 60)
-        print("HUMAN REVIEW REQUIRED")
-        print("=" * 60)
-        print("\nCurrent Draft:")
-        print(self.state.draft)
-        print("\n" + "-" * 60)
-
-        # Simulate human feedback input
-        print("\nOptions:")
-        print("1. Type 'approve' to accept the proposal")
-        print("2. Type 'reject' to reject and end the flow")
-        print("3. Type any feedback to request revisions")
-
-        feedback = input("\nYour feedback: ").strip()
+        self._pending_input = asyncio.get_running_loop().create_future()
+        self._events.put_nowait({"type": "input_required", "draft": self.state.draft})
+        feedback = (await self._pending_input).strip()
 
         if feedback.lower() == "approve":
             self.state.status = "approved"
@@ -102,12 +179,7 @@ Revision #{self.state.revision_count}
     @router(review_proposal)
     def route_after_review(self):
         """Route based on review outcome."""
-        if self.state.status == "approved":
-            return "finalize"
-        elif self.state.status == "rejected":
-            return "handle_rejection"
-        else:
-            return "revise"
+        return _ROUTE_TABLE.get(self.state.status, "revise")
 
     @listen("finalize")
     def finalize_proposal(self):
@@ -136,9 +208,9 @@ Feedback: {self.state.feedback}
 The proposal has been rejected and will not proceed.
 """
 
-    @listen("revise")
+    @router("revise")
     def revise_proposal(self):
-        """Revise the proposal based on feedback."""
+        """Revise the proposal based on feedback, then route back to review."""
         self.state.revision_count += 1
 
         if self.state.revision_count >= 3:
@@ -150,37 +222,82 @@ The proposal has been rejected and will not proceed.
         print(f"[Flow] Incorporating feedback: {self.state.feedback}")
 
         # Update draft with feedback
-        self.state.draft = f"""
-Proposal: {self.state.topic}
-============================
-[REVISED based on feedback: {self.state.feedback}]
-
-Executive Summary:
-This revised proposal addresses the feedback provided.
-
-Objectives (Updated):
-1. Refined goal based on reviewer feedback
-2. Additional considerations
-3. Updated success metrics
-
-Timeline (Adjusted):
-- Phase 1: Extended planning
-- Phase 2: Implementation with checkpoints
-- Phase 3: Comprehensive review
-
-Budget Estimate:
-[Updated based on revised scope]
+        self.state.draft = _REVISED_TEMPLATE.format_map(
+            {
+                "topic": self.state.topic,
+                "feedback": self.state.feedback,
+                "rev": self.state.revision_count,
+            }
+        )
+        # Go back to review: the flow schedules review_proposal again
+        # instead of this step calling it (no recursion per revision)
+        return "review"
+
+
+async def run_console_review(flow: ProposalFlow):
+    """Answer the flow's review requests from the console; returns the flow result."""
+    result = None
+    async for event in flow.stream_events():
+        if event["type"] == "input_required":
+            print("\n" + _BAR)
+            print("HUMAN REVIEW REQUIRED")
+            print(_BAR)
+            print("\nCurrent Draft:")
+            print(event["draft"])
+            print("\n" + _HALFBAR)
+
+            print("\nOptions:")
+            print("1. Type 'approve' to accept the proposal")
+            print("2. Type 'reject' to reject and end the flow")
+            print("3. Type any feedback to request revisions")
+
+            # input() runs in a worker thread so the flow's event loop keeps running
+            feedback = await asyncio.to_thread(input, "\nYour feedback: ")
+            flow.submit_feedback(feedback)
+        elif event["type"] == "finished":
+            result = event["result"]
+    return result
+
+
+async def run_scripted_review(flow: ProposalFlow, answers: list[str]):
+    """Answer the flow's review requests from a list; returns the flow result."""
+    answers = iter(answers)
+    result = None
+    async for event in flow.stream_events():
+        if event["type"] == "input_required":
+            flow.submit_feedback(next(answers))
+        elif event["type"] == "finished":
+            result = event["result"]
+    return result
+
+
+def check_revision_loop():
+    """Check that feedback goes revise -> review -> approve and finalizes."""
+    flow = ProposalFlow()
+    result = asyncio.run(run_scripted_review(flow, ["more detail", "approve"]))
 
-Revision #{self.state.revision_count}
-"""
-        # Go back to review
-        return self.review_proposal()
+    assert flow.state.status == "finalized", flow.state.status
+    assert flow.state.revision_count == 1, flow.state.revision_count
+    assert "FINAL PROPOSAL" in result, result
+    print("Revision loop OK: revise -> review -> approve -> finalized (1 revision)")
 
 
 def main():
-    print("=" * 60)
+    parser = argparse.ArgumentParser(description="HITL: Flow-based Human Feedback Test")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Run one revision round with scripted feedback instead of the console",
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        check_revision_loop()
+        return
+
+    print(_BAR)
     print("HITL: Flow-based Human Feedback Test")
-    print("=" * 60)
+    print(_BAR)
     print("""
 This example demonstrates human-in-the-loop using CrewAI Flow.
 The flow will pause at review points and wait for human input.
@@ -199,20 +316,20 @@ LangGraph Comparison:
     # Initialize flow (state uses default values from ProposalState)
     flow = ProposalFlow()
 
-    print("\n" + "=" * 60)
+    print("\n" + _BAR)
     print("Starting Flow Execution")
-    print("=" * 60)
+    print(_BAR)
 
-    result = flow.kickoff()
+    result = asyncio.run(run_console_review(flow))
 
-    print("\n" + "=" * 60)
+    print("\n" + _BAR)
     print("Flow Result:")
-    print("=" * 60)
+    print(_BAR)
     print(result)
 
-    print("\n" + "=" * 60)
+    print("\n" + _BAR)
     print("Final State:")
-    print("=" * 60)
+    print(_BAR)
     print(f"Status: {flow.state.status}")
     print(f"Revisions: {flow.state.revision_count}")
     print(f"Last Feedback: {flow.state.feedback}")
@@ -11,11 +11,23 @@ LangGraph Comparison:
 - CrewAI: State management with Flow + Pydantic state
 """
 
+import io
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
 from crewai.flow.flow import Flow, listen, start
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+
+from _common import get_event_logger
+
+
+# Step progress goes out as JSON events; main() output stays plain text
+log = get_event_logger()
+
+# Console separators
+_BAR = "=" * 60
 
 
 # DB configuration for persistence
@@ -23,15 +35,40 @@ DB_PATH = Path("./db")
 DB_PATH.mkdir(exist_ok=True)
 
 
+@dataclass(slots=True, frozen=True)
+class HistoryEntry:
+    """One completed step in the workflow history."""
+
+    step: str
+    timestamp: str
+    status: str
+    extra: dict | None = None
+
+
+class Analysis(BaseModel):
+    """Statistics produced by the processing step."""
+
+    mean: float = 0.0
+    median: float = 0.0
+    std_dev: float = 0.0
+
+
 class WorkflowState(BaseModel):
     """State for the workflow."""
 
+    # Steps mutate the state field by field; assignments are not revalidated
+    model_config = ConfigDict(validate_assignment=False)
+
     workflow_id: str = ""
     current_step: str = "init"
-    data: dict = {}
-    history: list = []
+    data: dict = Field(default_factory=dict)
+    analysis: Analysis = Field(default_factory=Analysis)
+    history: list[HistoryEntry] = Field(default_factory=list)
     created_at: str = ""
     updated_at: str = ""
+    # Rendered report and the history length it was rendered at
+    cached_report: str = ""
+    cached_history_len: int = 0
 
 
 class SimpleWorkflow(Flow[WorkflowState]):
@@ -45,24 +82,23 @@ class SimpleWorkflow(Flow[WorkflowState]):
     @start()
     def step1_initialize(self):
         """Initialize the workflow."""
-        print("\n[Step 1] Initializing workflow...")
+        log.info("step.started", extra={"step": "initialize"})
 
-        self.state.workflow_id = f"workflow_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # created_at, updated_at and the history entry share one timestamp
+        ts = datetime.now().isoformat()
+        # IDs only need to be unique: nanoseconds, no strftime formatting
+        self.state.workflow_id = f"workflow_{time.time_ns()}"
         self.state.current_step = "initialized"
-        self.state.created_at = datetime.now().isoformat()
-        self.state.updated_at = datetime.now().isoformat()
-        self.state.history.append({
-            "step": "initialize",
-            "timestamp": datetime.now().isoformat(),
-            "status": "completed"
-        })
+        self.state.created_at = ts
+        self.state.updated_at = ts
+        self.state.history.append(HistoryEntry(step="initialize", timestamp=ts, status="completed"))
 
-        print(f"[Step 1] Workflow ID: {self.state.workflow_id}")
+        log.info("step.completed", extra={"step": "initialize", "workflow_id": self.state.workflow_id})
 
     @listen(step1_initialize)
     def step2_gather_data(self):
         """Gather data step."""
-        print("\n[Step 2] Gathering data...")
+        log.info("step.started", extra={"step": "gather_data"})
 
         # Simulate data gathering
         self.state.data = {
@@ -70,53 +106,56 @@ class SimpleWorkflow(Flow[WorkflowState]):
             "records": 100,
             "quality_score": 0.95
         }
+        ts = datetime.now().isoformat()
         self.state.current_step = "data_gathered"
-        self.state.updated_at = datetime.now().isoformat()
-        self.state.history.append({
-            "step": "gather_data",
-            "timestamp": datetime.now().isoformat(),
-            "status": "completed",
-            "records": 100
-        })
+        self.state.updated_at = ts
+        self.state.history.append(
+            HistoryEntry(step="gather_data", timestamp=ts, status="completed", extra={"records": 100})
+        )
 
-        print(f"[Step 2] Gathered {self.state.data['records']} records")
+        log.info("step.completed", extra={"step": "gather_data", "records": self.state.data["records"]})
 
     @listen(step2_gather_data)
     def step3_process_data(self):
         """Process the gathered data."""
-        print("\n[Step 3] Processing data...")
+        log.info("step.started", extra={"step": "process_data"})
 
         # Simulate processing
         self.state.data["processed"] = True
-        self.state.data["analysis"] = {
-            "mean": 42.5,
-            "median": 40.0,
-            "std_dev": 5.2
-        }
+        self.state.analysis = Analysis(mean=42.5, median=40.0, std_dev=5.2)
+        ts = datetime.now().isoformat()
         self.state.current_step = "data_processed"
-        self.state.updated_at = datetime.now().isoformat()
-        self.state.history.append({
-            "step": "process_data",
-            "timestamp": datetime.now().isoformat(),
-            "status": "completed"
-        })
+        self.state.updated_at = ts
+        self.state.history.append(HistoryEntry(step="process_data", timestamp=ts, status="completed"))
 
-        print(f"[Step 3] Processing complete. Analysis: {self.state.data['analysis']}")
+        log.info(
+            "step.completed",
+            extra={"step": "process_data", "analysis": self.state.analysis.model_dump()},
+        )
 
     @listen(step3_process_data)
     def step4_generate_report(self):
         """Generate final report."""
-        print("\n[Step 4] Generating report...")
+        log.info("step.started", extra={"step": "generate_report"})
 
+        ts = datetime.now().isoformat()
         self.state.current_step = "completed"
-        self.state.updated_at = datetime.now().isoformat()
-        self.state.history.append({
-            "step": "generate_report",
-            "timestamp": datetime.now().isoformat(),
-            "status": "completed"
-        })
-
-        report = f"""
+        self.state.updated_at = ts
+        self.state.history.append(HistoryEntry(step="generate_report", timestamp=ts, status="completed"))
+
+        report = self.render_report()
+        print(report)
+        return report
+
+    def render_report(self) -> str:
+        """Render the workflow report; reused until the history grows."""
+        if self.state.cached_report and self.state.cached_history_len == len(self.state.history):
+            return self.state.cached_report
+
+        # Written into one buffer: the history section grows with every step
+        # and is streamed in line by line rather than joined separately
+        buf = io.StringIO()
+        buf.write(f"""
 Workflow Report
 ===============
 ID: {self.state.workflow_id}
@@ -128,21 +167,23 @@ Data Summary:
 - Quality Score: {self.state.data.get('quality_score', 'N/A')}
 
 Analysis Results:
-- Mean: {self.state.data.get('analysis', {}).get('mean', 'N/A')}
-- Median: {self.state.data.get('analysis', {}).get('median', 'N/A')}
-- Std Dev: {self.state.data.get('analysis', {}).get('std_dev', 'N/A')}
+- Mean: {self.state.analysis.mean}
+- Median: {self.state.analysis.median}
+- Std Dev: {self.state.analysis.std_dev}
 
 Execution History:
-{chr(10).join([f"  - {h['step']}: {h['status']} at {h['timestamp']}" for h in self.state.history])}
-"""
-        print(report)
-        return report
+""")
+        for h in self.state.history:
+            buf.write(f"  - {h.step}: {h.status} at {h.timestamp}\n")
+        self.state.cached_report = buf.getvalue()
+        self.state.cached_history_len = len(self.state.history)
+        return self.state.cached_report
 
 
 def main():
-    print("=" * 60)
+    print(_BAR)
     print("Durable Execution: Basic Flow Test")
-    print("=" * 60)
+    print(_BAR)
     print("""
 This example demonstrates CrewAI Flow for workflow management.
 
@@ -157,26 +198,27 @@ LangGraph Comparison:
 """)
 
     # Run the workflow
-    print("\n" + "=" * 60)
+    print("\n" + _BAR)
     print("Executing Workflow")
-    print("=" * 60)
+    print(_BAR)
 
     flow = SimpleWorkflow()
     result = flow.kickoff()
 
-    print("\n" + "=" * 60)
+    print("\n" + _BAR)
     print("Workflow Result:")
-    print("=" * 60)
+    print(_BAR)
     print(result)
 
     # Display final state
-    print("\n" + "=" * 60)
+    print("\n" + _BAR)
     print("Final State Object:")
-    print("=" * 60)
+    print(_BAR)
     print(f"Workflow ID: {flow.state.workflow_id}")
     print(f"Current Step: {flow.state.current_step}")
     print(f"History Length: {len(flow.state.history)}")
     print(f"Data: {flow.state.data}")
+    print(f"Analysis: {flow.state.analysis}")
 
 
 if __name__ == "__main__":
@@ -17,14 +17,19 @@ Usage:
 """
 
 import argparse
+import asyncio
+import functools
+import sqlite3
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
 
-from crewai.flow.flow import Flow, listen, start
-from crewai.flow.persistence import persist, SQLiteFlowPersistence
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Console separators
+_BAR = "=" * 60
 
 
 # Ensure db directory exists
@@ -35,112 +40,176 @@ DB_PATH.mkdir(exist_ok=True)
 class LongRunningState(BaseModel):
     """State for a long-running workflow that may need to be resumed."""
 
+    model_config = ConfigDict(validate_assignment=False)
+
     id: str = ""  # UUID managed by @persist
     flow_id: str = ""
     current_phase: int = 0
     total_phases: int = 5
-    results: list = Field(default_factory=list)
+    # Completed phases as parallel lists (one entry per phase, same index);
+    # the persisted state carries the keys once instead of once per result
+    result_phases: list[int] = Field(default_factory=list)
+    result_actions: list[str] = Field(default_factory=list)
     is_complete: bool = False
     started_at: str = ""
 
 
-# Use SQLite for persistence across process restarts
-sqlite_persistence = SQLiteFlowPersistence(db_path="./db/flow_state.db")
-
-
-@persist(persistence=sqlite_persistence, verbose=True)
-class ResumableWorkflow(Flow[LongRunningState]):
+@functools.cache
+def build_workflow():
     """
-    Workflow demonstrating @persist for automatic state persistence.
+    Define the persistence backend and the workflow; returns (workflow class, persistence).
 
-    Key: Use kickoff(inputs={'id': state_id}) to resume from persisted state.
+    crewai is imported here rather than at module scope, so printing the
+    usage (no --start/--resume) does not pay for importing it.
     """
-
-    @start()
-    def phase_0_initialize(self):
-        """Initialize the workflow."""
-        if self.state.current_phase > 0:
-            print(f"\n[Resume] Detected state at phase {self.state.current_phase}, skipping init...")
-            return
-
-        print("\n[Phase 0] Initializing workflow...")
-        self.state.flow_id = f"flow_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        self.state.started_at = datetime.now().isoformat()
-        self.state.results.append({"phase": 0, "action": "initialize"})
-        print(f"[Phase 0] State ID: {self.state.id}")
-
-    @listen(phase_0_initialize)
-    def phase_1_data_collection(self):
-        """Phase 1: Data collection."""
-        if self.state.current_phase >= 1:
-            print("[Phase 1] Already completed, skipping...")
-            return
-
-        print("\n[Phase 1] Collecting data (1 second)...")
-        self.state.current_phase = 1
-        time.sleep(1)
-        self.state.results.append({"phase": 1, "action": "data_collection"})
-        print("[Phase 1] Complete.")
-
-    @listen(phase_1_data_collection)
-    def phase_2_validation(self):
-        """Phase 2: Validation."""
-        if self.state.current_phase >= 2:
-            print("[Phase 2] Already completed, skipping...")
-            return
-
-        print("\n[Phase 2] Validating (1 second)...")
-        self.state.current_phase = 2
-        time.sleep(1)
-        self.state.results.append({"phase": 2, "action": "validation"})
-        print("[Phase 2] Complete.")
-
-    @listen(phase_2_validation)
-    def phase_3_processing(self):
-        """Phase 3: Processing (interruptible)."""
-        if self.state.current_phase >= 3:
-            print("[Phase 3] Already completed, skipping...")
-            return
-
-        print("\n[Phase 3] Processing (3 seconds, interruptible)...")
-        self.state.current_phase = 3
-
-        for i in range(3):
-            print(f"[Phase 3] Batch {i+1}/3...")
-            time.sleep(1)
-
-        self.state.results.append({"phase": 3, "action": "processing"})
-        print("[Phase 3] Complete.")
-
-    @listen(phase_3_processing)
-    def phase_4_aggregation(self):
-        """Phase 4: Aggregation."""
-        if self.state.current_phase >= 4:
-            print("[Phase 4] Already completed, skipping...")
-            return
-
-        print("\n[Phase 4] Aggregating (1 second)...")
-        self.state.current_phase = 4
-        time.sleep(1)
-        self.state.results.append({"phase": 4, "action": "aggregation"})
-        print("[Phase 4] Complete.")
-
-    @listen(phase_4_aggregation)
-    def phase_5_finalize(self):
-        """Phase 5: Finalization."""
-        if self.state.is_complete:
-            print("[Phase 5] Already completed, skipping...")
+    from crewai.flow.flow import Flow, listen, or_, router, start
+    from crewai.flow.persistence import persist, SQLiteFlowPersistence
+
+    from _common import get_event_logger
+
+    # Phase progress goes out as JSON events; main() output stays plain text
+    log = get_event_logger()
+
+    class WALFlowPersistence(SQLiteFlowPersistence):
+        """
+        SQLiteFlowPersistence with the database in WAL journal mode.
+
+        @persist saves after every method. In WAL mode a save appends to the
+        write-ahead log instead of writing a rollback journal and the database file.
+        journal_mode is stored in the database file, so setting it once here
+        applies to the connections CrewAI opens for each save/load. Saves
+        themselves are CrewAI's own: WAL mode is the only change to how they
+        are written.
+
+        Loaded states are kept in memory per flow ID, so the resume check in
+        main() and the restore in kickoff() read the database once; a save
+        drops the cached entry.
+        """
+
+        def __init__(self, db_path: str | None = None):
+            # Set before super().__init__(), which already calls init_db()
+            self._state_cache: dict[str, dict | None] = {}
+            super().__init__(db_path=db_path)
+
+        def init_db(self) -> None:
+            super().init_db()
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+
+        def save_state(self, flow_uuid: str, method_name: str, state_data) -> None:
+            super().save_state(flow_uuid, method_name, state_data)
+            self._state_cache.pop(flow_uuid, None)
+
+        def load_state(self, flow_uuid: str) -> dict | None:
+            if flow_uuid not in self._state_cache:
+                self._state_cache[flow_uuid] = super().load_state(flow_uuid)
+            return self._state_cache[flow_uuid]
+
+
+    # Use SQLite for persistence across process restarts
+    sqlite_persistence = WALFlowPersistence(db_path="./db/flow_state.db")
+
+
+    @persist(persistence=sqlite_persistence, verbose=True)
+    class ResumableWorkflow(Flow[LongRunningState]):
+        """
+        Workflow demonstrating @persist for automatic state persistence.
+
+        Key: Use kickoff(inputs={'id': state_id}) to resume from persisted state.
+
+        The phases are coroutines and their simulated work awaits asyncio.sleep,
+        so the event loop is not blocked while a phase waits. They still run one
+        after another: each phase advances current_phase, which resume relies on.
+        """
+
+        @start()
+        async def phase_0_initialize(self):
+            """Initialize the workflow."""
+            if self.state.current_phase > 0:
+                log.info(
+                    "flow.resumed",
+                    extra={"phase": self.state.current_phase, "flow_id": self.state.id},
+                )
+                return
+
+            log.info("phase.started", extra={"phase": 0, "flow_id": self.state.id})
+            self.state.flow_id = f"flow_{time.time_ns()}"
+            self.state.started_at = datetime.now().isoformat()
+            self._record_result(0, "initialize")
+
+        @router(phase_0_initialize)
+        def route_to_next_phase(self):
+            """
+            Jump to the first phase that has not completed yet.
+
+            Persisted state is saved after each method completes, so current_phase
+            is the last finished phase. Phases before it are never dispatched; a
+            completed workflow goes to phase 5, which only reports.
+            """
+            return f"phase_{min(self.state.current_phase + 1, self.state.total_phases)}"
+
+        @listen("phase_1")
+        async def phase_1_data_collection(self):
+            """Phase 1: Data collection."""
+            log.info("phase.started", extra={"phase": 1, "flow_id": self.state.id})
+            self.state.current_phase = 1
+            await asyncio.sleep(1)
+            self._record_result(1, "data_collection")
+
+        @listen(or_(phase_1_data_collection, "phase_2"))
+        async def phase_2_validation(self):
+            """Phase 2: Validation."""
+            log.info("phase.started", extra={"phase": 2, "flow_id": self.state.id})
+            self.state.current_phase = 2
+            await asyncio.sleep(1)
+            self._record_result(2, "validation")
+
+        @listen(or_(phase_2_validation, "phase_3"))
+        async def phase_3_processing(self):
+            """Phase 3: Processing (interruptible)."""
+            log.info("phase.started", extra={"phase": 3, "flow_id": self.state.id})
+            self.state.current_phase = 3
+
+            for i in range(3):
+                # Progress during the phase meant for Ctrl+C: INFO, and flushed
+                # past the stdout block buffer so it shows before the wait
+                log.info("phase.batch", extra={"phase": 3, "batch": i + 1, "of": 3})
+                sys.stdout.flush()
+                await asyncio.sleep(1)
+
+            self._record_result(3, "processing")
+
+        @listen(or_(phase_3_processing, "phase_4"))
+        async def phase_4_aggregation(self):
+            """Phase 4: Aggregation."""
+            log.info("phase.started", extra={"phase": 4, "flow_id": self.state.id})
+            self.state.current_phase = 4
+            await asyncio.sleep(1)
+            self._record_result(4, "aggregation")
+
+        @listen(or_(phase_4_aggregation, "phase_5"))
+        async def phase_5_finalize(self):
+            """Phase 5: Finalization."""
+            if self.state.is_complete:
+                log.info("flow.already_complete", extra={"flow_id": self.state.id})
+                return self._report()
+
+            log.info("phase.started", extra={"phase": 5, "flow_id": self.state.id})
+            self.state.current_phase = 5
+            self.state.is_complete = True
+            self._record_result(5, "finalize")
             return self._report()
 
-        print("\n[Phase 5] Finalizing...")
-        self.state.current_phase = 5
-        self.state.is_complete = True
-        self.state.results.append({"phase": 5, "action": "finalize"})
-        print("[Phase 5] Complete!")
-        return self._report()
+        def _record_result(self, phase: int, action: str):
+            self.state.result_phases.append(phase)
+            self.state.result_actions.append(action)
+            log.info(
+                "phase.completed",
+                extra={"phase": phase, "action": action, "flow_id": self.state.id},
+            )
 
-    def _report(self):
-        return f"""
+        def _report(self):
+            return f"""
 Workflow Report
 ===============
 State ID: {self.state.id}
@@ -148,6 +217,8 @@ Phases: {self.state.current_phase}/{self.state.total_phases}
 Status: {'COMPLETE' if self.state.is_complete else 'INCOMPLETE'}
 """
 
+    return ResumableWorkflow, sqlite_persistence
+
 
 def main():
     parser = argparse.ArgumentParser(description="Resumable Workflow with @persist")
@@ -155,11 +226,13 @@ def main():
     parser.add_argument("--resume", type=str, help="Resume with state ID")
     args = parser.parse_args()
 
-    print("=" * 60)
+    print(_BAR)
     print("Durable Execution: @persist Resume Test")
-    print("=" * 60)
+    print(_BAR)
 
     if args.resume:
+        ResumableWorkflow, sqlite_persistence = build_workflow()
+
         # Verify state exists
         state = sqlite_persistence.load_state(args.resume)
         if not state:
@@ -172,18 +245,19 @@ def main():
         try:
             # KEY: Pass ID via kickoff inputs to restore state
             result = flow.kickoff(inputs={'id': args.resume})
-            print("\n" + "=" * 60)
+            print("\n" + _BAR)
             print(result)
         except KeyboardInterrupt:
             print(f"\n\nInterrupted! Resume with: --resume {flow.state.id}")
 
     elif args.start:
+        ResumableWorkflow, _ = build_workflow()
         print("\nStarting new workflow (Ctrl+C to interrupt)...\n")
 
         flow = ResumableWorkflow()
         try:
             result = flow.kickoff()
-            print("\n" + "=" * 60)
+            print("\n" + _BAR)
             print(result)
         except KeyboardInterrupt:
             print(f"\n\nInterrupted at phase {flow.state.current_phase}!")
@@ -199,7 +273,7 @@ Usage:
 How @persist works:
 1. State saved to SQLite after each method
 2. Pass same ID via kickoff(inputs={'id': ...}) to restore
-3. Check current_phase in each method to skip completed work
+3. A router after phase 0 jumps to the first unfinished phase
 
 Key Discovery:
   kickoff(inputs={'id': state_id}) triggers automatic state restoration!
@@ -11,13 +11,54 @@ CrewAI-specific feature:
 - LangGraph requires explicit routing implementation
 """
 
+import argparse
+import asyncio
+import functools
+from textwrap import dedent
+
 from crewai import Agent, Task, Crew, Process
 from crewai.tools import tool
 
+from _common import VERBOSE, cached_kickoff, count_tokens, default_llm
+
+
+# Code under review
+REVIEW_CODE = '''```python
+def process_user_data(user_input):
+    # Process user data from form submission
+    data = eval(user_input)  # Parse the input
+    results = []
+    for item in data:
+        results.append(item * 2)
+    return results
+```'''
+
+# Static text first (instructions, then the snippet) so every run shares the
+# same prompt prefix
+REVIEW_DESCRIPTION = f"""Perform a comprehensive review of the following code:
+
+{REVIEW_CODE}
+
+The review should cover:
+1. General code quality
+2. Security considerations (delegate to security expert if needed)
+3. Performance analysis (delegate to performance expert if needed)
+
+Provide a unified report combining all findings."""
+
+REVIEW_EXPECTED_OUTPUT = dedent("""\
+    A comprehensive code review report including:
+    - Code quality assessment
+    - Security findings
+    - Performance analysis
+    - Overall recommendations""").strip()
+
 
 # =============================================================================
 # Tools for specialized agents
 # =============================================================================
+# Each report depends only on the snippet, so each tool's body is lru_cached:
+# a repeat call of the same tool on the same code returns the cached report.
 @tool("Code Analyzer")
 def analyze_code(code_snippet: str) -> str:
     """
@@ -26,6 +67,11 @@ def analyze_code(code_snippet: str) -> str:
     Args:
         code_snippet: The code to analyze
     """
+    return _analyze_code(code_snippet)
+
+
+@functools.lru_cache(maxsize=512)
+def _analyze_code(code_snippet: str) -> str:
     return f"""
 Code Analysis Report:
 - Lines of code: {len(code_snippet.splitlines())}
@@ -45,6 +91,11 @@ def security_scan(code_snippet: str) -> str:
     Args:
         code_snippet: The code to scan
     """
+    return _security_scan(code_snippet)
+
+
+@functools.lru_cache(maxsize=512)
+def _security_scan(code_snippet: str) -> str:
     return f"""
 Security Scan Report:
 - Vulnerabilities found: 0 critical, 1 warning
@@ -62,6 +113,11 @@ def profile_performance(code_snippet: str) -> str:
     Args:
         code_snippet: The code to profile
     """
+    return _profile_performance(code_snippet)
+
+
+@functools.lru_cache(maxsize=512)
+def _profile_performance(code_snippet: str) -> str:
     return f"""
 Performance Profile:
 - Time complexity: O(n)
@@ -72,29 +128,14 @@ Performance Profile:
 """
 
 
-def main():
-    print("=" * 60)
-    print("Role-Based Collaboration: Delegation Test")
-    print("=" * 60)
-    print("""
-This example demonstrates CrewAI's agent delegation feature.
-When allow_delegation=True, agents can delegate tasks to other
-agents they deem more suitable.
-
-Key Points:
-- Delegation is automatic based on agent roles/capabilities
-- The delegating agent decides when another agent is better suited
-- This is a CrewAI-specific feature not found in LangGraph
-
-LangGraph Comparison:
-- CrewAI: allow_delegation=True (automatic)
-- LangGraph: Explicit router/conditional edges (manual)
-""")
-
-    # ==========================================================================
-    # Define specialized agents
-    # ==========================================================================
+@functools.cache
+def build_team(lead_delegates: bool = True):
+    """
+    Lead developer and specialists shared by main() and the comparisons.
 
+    Built once per lead_delegates value: the demos run in one process reuse
+    the same agents (and their LLM) instead of constructing them again.
+    """
     # Lead developer who can delegate
     lead_developer = Agent(
         role="Lead Developer",
@@ -104,8 +145,9 @@ LangGraph Comparison:
         work to experts. You know when security or performance reviews
         need a specialist's attention.""",
         tools=[analyze_code],
-        allow_delegation=True,  # <-- Enable delegation
-        verbose=True,
+        allow_delegation=lead_delegates,  # <-- Enable delegation
+        llm=default_llm(),
+        verbose=VERBOSE,
     )
 
     # Security specialist
@@ -117,7 +159,8 @@ LangGraph Comparison:
         and recommending secure coding practices.""",
         tools=[security_scan],
         allow_delegation=False,  # Specialists don't delegate
-        verbose=True,
+        llm=default_llm(),
+        verbose=VERBOSE,
     )
 
     # Performance specialist
@@ -129,38 +172,54 @@ LangGraph Comparison:
         recommendations.""",
         tools=[profile_performance],
         allow_delegation=False,
-        verbose=True,
+        llm=default_llm(),
+        verbose=VERBOSE,
     )
 
+    return lead_developer, security_expert, performance_expert
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--count-tokens",
+        action="store_true",
+        help="Print the review prompt's token count (loads tiktoken, downloading its encoding on first use)",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Role-Based Collaboration: Delegation Test")
+    print("=" * 60)
+    print("""
+This example demonstrates CrewAI's agent delegation feature.
+When allow_delegation=True, agents can delegate tasks to other
+agents they deem more suitable.
+
+Key Points:
+- Delegation is automatic based on agent roles/capabilities
+- The delegating agent decides when another agent is better suited
+- This is a CrewAI-specific feature not found in LangGraph
+
+LangGraph Comparison:
+- CrewAI: allow_delegation=True (automatic)
+- LangGraph: Explicit router/conditional edges (manual)
+""")
+
+    # ==========================================================================
+    # Define specialized agents
+    # ==========================================================================
+
+    lead_developer, security_expert, performance_expert = build_team()
+
     # ==========================================================================
     # Define tasks
     # ==========================================================================
 
     # Main review task assigned to lead
     comprehensive_review = Task(
-        description="""Perform a comprehensive review of the following code:
-
-```python
-def process_user_data(user_input):
-    # Process user data from form submission
-    data = eval(user_input)  # Parse the input
-    results = []
-    for item in data:
-        results.append(item * 2)
-    return results
-```
-
-The review should cover:
-1. General code quality
-2. Security considerations (delegate to security expert if needed)
-3. Performance analysis (delegate to performance expert if needed)
-
-Provide a unified report combining all findings.""",
-        expected_output="""A comprehensive code review report including:
-- Code quality assessment
-- Security findings
-- Performance analysis
-- Overall recommendations""",
+        description=REVIEW_DESCRIPTION,
+        expected_output=REVIEW_EXPECTED_OUTPUT,
         agent=lead_developer,
     )
 
@@ -171,19 +230,21 @@ Provide a unified report combining all findings.""",
         agents=[lead_developer, security_expert, performance_expert],
         tasks=[comprehensive_review],
         process=Process.sequential,  # Sequential for clear delegation observation
-        verbose=True,
+        verbose=VERBOSE,
     )
 
     print("\n" + "=" * 60)
     print("Executing Crew with Delegation")
     print("=" * 60)
+    if args.count_tokens:
+        print(f"Review task prompt: {count_tokens(REVIEW_DESCRIPTION)} tokens")
     print("""
-Watch for delegation behavior:
+Watch for delegation behavior (shown in the agent trace; run with CREW_VERBOSE=1):
 - Lead developer may delegate security review to Security Expert
 - Lead developer may delegate performance analysis to Performance Engineer
 """)
 
-    result = crew.kickoff()
+    result = cached_kickoff(crew, cache=False)  # Delegation and token usage must be from this run
 
     print("\n" + "=" * 60)
     print("Result:")
@@ -210,7 +271,8 @@ def demo_no_delegation():
         backstory="You must handle all aspects of code review yourself.",
         tools=[analyze_code, security_scan, profile_performance],
         allow_delegation=False,  # No delegation
-        verbose=True,
+        llm=default_llm(),
+        verbose=VERBOSE,
     )
 
     solo_review = Task(
@@ -227,15 +289,140 @@ def calculate_total(items):
     crew = Crew(
         agents=[solo_developer],
         tasks=[solo_review],
-        verbose=True,
+        verbose=VERBOSE,
     )
 
-    result = crew.kickoff()
+    result = cached_kickoff(crew)
     print("\nSolo Review Result:")
     print(result)
 
 
+def demo_parallel_review():
+    """
+    Compare: the specialist reviews as an explicit parallel fan-out.
+
+    Instead of the lead deciding (via LLM reasoning) to delegate, the
+    security and performance reviews run as their own crews, concurrently,
+    and the lead only synthesizes their findings.
+    """
+    print("\n" + "=" * 60)
+    print("Comparison: Parallel Specialist Reviews (no delegation)")
+    print("=" * 60)
+
+    lead_developer, security_expert, performance_expert = build_team(lead_delegates=False)
+    reviews = [
+        (security_expert, "security vulnerabilities", "Security findings"),
+        (performance_expert, "performance issues", "Performance findings"),
+    ]
+    crews = [
+        Crew(
+            agents=[agent],
+            tasks=[
+                Task(
+                    description=f"Review the following code for {focus}:\n\n{REVIEW_CODE}",
+                    expected_output=expected,
+                    agent=agent,
+                )
+            ],
+            verbose=VERBOSE,
+        )
+        for agent, focus, expected in reviews
+    ]
+
+    async def run_reviews():
+        return await asyncio.gather(*(crew.kickoff_async() for crew in crews))
+
+    security, performance = asyncio.run(run_reviews())
+
+    # {security} and {performance} are filled from the kickoff inputs
+    synthesis = Task(
+        description=f"""Perform a comprehensive review of the following code:
+
+{REVIEW_CODE}
+
+Cover general code quality yourself and combine it with the specialist findings.
+
+Security review:
+{{security}}
+
+Performance review:
+{{performance}}
+
+Provide a unified report combining all findings.""",
+        expected_output=REVIEW_EXPECTED_OUTPUT,
+        agent=lead_developer,
+    )
+    crew = Crew(agents=[lead_developer], tasks=[synthesis], verbose=VERBOSE)
+
+    result = cached_kickoff(crew, inputs={"security": security.raw, "performance": performance.raw})
+    print("\nParallel Review Result:")
+    print(result)
+
+
+def demo_static_routing():
+    """
+    Compare: the review workflow as a fixed task graph in one crew.
+
+    The shape of the review is known up front (quality analysis, then the
+    security and performance reviews side by side, then a synthesis), so it
+    is wired with context=[...] instead of letting the lead reason about
+    whom to delegate to:
+
+        quality -> security    -> synthesis
+                -> performance ->
+
+    The two specialist tasks run with async_execution=True, concurrently.
+    """
+    print("\n" + "=" * 60)
+    print("Comparison: Static Routing (task graph, no delegation)")
+    print("=" * 60)
+
+    lead_developer, security_expert, performance_expert = build_team(lead_delegates=False)
+
+    quality_task = Task(
+        description=f"Analyze the general quality of the following code:\n\n{REVIEW_CODE}",
+        expected_output="Code quality findings",
+        agent=lead_developer,
+    )
+    security_task = Task(
+        description=f"Review the following code for security vulnerabilities:\n\n{REVIEW_CODE}",
+        expected_output="Security findings",
+        agent=security_expert,
+        context=[quality_task],
+        async_execution=True,
+    )
+    performance_task = Task(
+        description=f"Review the following code for performance issues:\n\n{REVIEW_CODE}",
+        expected_output="Performance findings",
+        agent=performance_expert,
+        context=[quality_task],
+        async_execution=True,
+    )
+    synthesis_task = Task(
+        description="Combine the quality, security and performance findings "
+        "into a unified code review report.",
+        expected_output=REVIEW_EXPECTED_OUTPUT,
+        agent=lead_developer,
+        context=[quality_task, security_task, performance_task],
+    )
+
+    crew = Crew(
+        agents=[lead_developer, security_expert, performance_expert],
+        tasks=[quality_task, security_task, performance_task, synthesis_task],
+        process=Process.sequential,
+        verbose=VERBOSE,
+    )
+
+    result = cached_kickoff(crew)
+    print("\nStatic Routing Result:")
+    print(result)
+
+
 if __name__ == "__main__":
     main()
     # Uncomment to see comparison without delegation:
     # demo_no_delegation()
+    # Uncomment to run the specialist reviews in parallel instead of delegating:
+    # demo_parallel_review()
+    # Uncomment to run the review as a fixed task graph instead of delegating:
+    # demo_static_routing()
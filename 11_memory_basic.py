@@ -11,8 +11,55 @@ LangGraph Comparison:
 - CrewAI: Automatic memory enablement with memory=True
 """
 
+from textwrap import dedent
+
 from crewai import Agent, Task, Crew
 
+from _common import LOCAL_EMBEDDER, VERBOSE, cached_kickoff, default_llm
+
+
+# Prompt text (dedented once at import). The three Project Alpha tasks run
+# on the same agent and open with the same preamble, so their prompts share
+# one prefix (system prompt + preamble) that the provider can cache.
+PROJECT_ALPHA_PREAMBLE = (
+    "You are tracking Project Alpha so that you can brief its stakeholders.\n\n"
+)
+
+LEARN_DESCRIPTION = PROJECT_ALPHA_PREAMBLE + dedent("""\
+    Learn and memorize the following information about Project Alpha:
+    - Project Code: ALPHA-2024
+    - Budget: $2.5 million
+    - Team Lead: Dr. Sarah Chen
+    - Start Date: January 2024
+    - Primary Goal: Develop an AI-powered analytics platform
+
+    Confirm that you have memorized this information.""").strip()
+
+RECALL_DESCRIPTION = PROJECT_ALPHA_PREAMBLE + dedent("""\
+    Without being given the information again, answer
+    these questions about Project Alpha:
+    1. What is the project code?
+    2. Who is the team lead?
+    3. What is the budget?
+
+    This tests your short-term memory from the previous task.""").strip()
+
+APPLY_DESCRIPTION = PROJECT_ALPHA_PREAMBLE + dedent("""\
+    Using your memory of Project Alpha, create a brief
+    project summary email that could be sent to stakeholders.
+    Include all the key details you remember.""").strip()
+
+GATHER_DESCRIPTION = dedent("""\
+    Record the following facts:
+    - The secret code is 'OMEGA-777'
+    - The meeting is at 3 PM
+    - The contact person is John""").strip()
+
+PROCESS_DESCRIPTION = dedent("""\
+    Based on the information gathered by your colleague,
+    what is the secret code and when is the meeting?
+    (Note: This tests if memory is shared between agents)""").strip()
+
 
 def main():
     print("=" * 60)
@@ -41,7 +88,8 @@ LangGraph Comparison:
         backstory="""You are a helpful research assistant with excellent
         memory. You remember details from previous interactions and use
         them to provide better assistance.""",
-        verbose=True,
+        llm=default_llm(),
+        verbose=VERBOSE,
         memory=True,  # Enable agent-level memory
     )
 
@@ -51,36 +99,21 @@ LangGraph Comparison:
 
     # Task 1: Learn information
     learn_task = Task(
-        description="""Learn and memorize the following information about Project Alpha:
-        - Project Code: ALPHA-2024
-        - Budget: $2.5 million
-        - Team Lead: Dr. Sarah Chen
-        - Start Date: January 2024
-        - Primary Goal: Develop an AI-powered analytics platform
-
-        Confirm that you have memorized this information.""",
+        description=LEARN_DESCRIPTION,
         expected_output="Confirmation that the information has been memorized",
         agent=assistant,
     )
 
     # Task 2: Recall information (tests short-term memory)
     recall_task = Task(
-        description="""Without being given the information again, answer
-        these questions about Project Alpha:
-        1. What is the project code?
-        2. Who is the team lead?
-        3. What is the budget?
-
-        This tests your short-term memory from the previous task.""",
+        description=RECALL_DESCRIPTION,
         expected_output="Answers to all three questions from memory",
         agent=assistant,
     )
 
     # Task 3: Apply remembered information
     apply_task = Task(
-        description="""Using your memory of Project Alpha, create a brief
-        project summary email that could be sent to stakeholders.
-        Include all the key details you remember.""",
+        description=APPLY_DESCRIPTION,
         expected_output="A professional email summarizing Project Alpha",
         agent=assistant,
     )
@@ -91,13 +124,12 @@ LangGraph Comparison:
     crew = Crew(
         agents=[assistant],
         tasks=[learn_task, recall_task, apply_task],
-        verbose=True,
+        verbose=VERBOSE,
         memory=True,  # Enable crew-level memory
-        # embedder configuration can be customized:
-        # embedder={
-        #     "provider": "openai",
-        #     "config": {"model": "text-embedding-3-small"}
-        # }
+        # Local ONNX embeddings; for OpenAI use e.g.
+        # {"provider": "openai", "config": {"model": "text-embedding-3-small"}}
+        embedder=LOCAL_EMBEDDER,
+        stream=True,  # Print each task's output as it is generated
     )
 
     print("\n" + "=" * 60)
@@ -112,22 +144,22 @@ Task Flow:
 Watch for memory usage in the agent's reasoning.
 """)
 
-    result = crew.kickoff()
+    # memory=True crews are never served from the response cache, so this
+    # always runs (and streams)
+    result = cached_kickoff(crew)
 
     print("\n" + "=" * 60)
     print("Result:")
     print("=" * 60)
     print(result)
 
-    # Show task outputs for detailed analysis
+    # The task outputs were streamed in full above; list where each came from
     if result.tasks_output:
         print("\n" + "=" * 60)
         print("Individual Task Outputs:")
         print("=" * 60)
         for i, task_output in enumerate(result.tasks_output):
-            print(f"\nTask {i+1}:")
-            print("-" * 40)
-            print(task_output.raw[:500] if len(task_output.raw) > 500 else task_output.raw)
+            print(f"Task {i+1} ({task_output.agent}): {len(task_output.raw)} characters")
 
 
 def test_multi_agent_memory():
@@ -141,7 +173,8 @@ def test_multi_agent_memory():
         role="Information Gatherer",
         goal="Gather and store information",
         backstory="You collect information and pass it to colleagues.",
-        verbose=True,
+        llm=default_llm(),
+        verbose=VERBOSE,
         memory=True,
     )
 
@@ -149,23 +182,19 @@ def test_multi_agent_memory():
         role="Information Processor",
         goal="Process information gathered by others",
         backstory="You work with information collected by your colleagues.",
-        verbose=True,
+        llm=default_llm(),
+        verbose=VERBOSE,
         memory=True,
     )
 
     task_gather = Task(
-        description="""Record the following facts:
-        - The secret code is 'OMEGA-777'
-        - The meeting is at 3 PM
-        - The contact person is John""",
+        description=GATHER_DESCRIPTION,
         expected_output="Confirmation of recorded facts",
         agent=agent_a,
     )
 
     task_process = Task(
-        description="""Based on the information gathered by your colleague,
-        what is the secret code and when is the meeting?
-        (Note: This tests if memory is shared between agents)""",
+        description=PROCESS_DESCRIPTION,
         expected_output="The secret code and meeting time",
         agent=agent_b,
     )
@@ -173,11 +202,13 @@ def test_multi_agent_memory():
     crew = Crew(
         agents=[agent_a, agent_b],
         tasks=[task_gather, task_process],
-        verbose=True,
+        verbose=VERBOSE,
         memory=True,
+        embedder=LOCAL_EMBEDDER,
+        stream=True,  # Print output as it is generated
     )
 
-    result = crew.kickoff()
+    result = cached_kickoff(crew)
     print("\nMulti-Agent Memory Result:")
     print(result)
 
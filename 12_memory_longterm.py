@@ -16,9 +16,19 @@ LangGraph Comparison:
 """
 
 import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import re
+import sqlite3
 from pathlib import Path
+from textwrap import dedent
 
-from crewai import Agent, Task, Crew
+from pydantic import BaseModel, Field
+
+# crewai (and _common, which imports it) is imported inside the functions
+# that build agents and crews, so --check and the usage text do not load it
 
 
 # Memory storage location (CrewAI default uses SQLite)
@@ -26,6 +36,131 @@ MEMORY_DIR = Path("./db/memory")
 MEMORY_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def memory_db_dirs():
+    """Where CrewAI's SQLite memory files (*.db) can live."""
+    from crewai.utilities.paths import db_storage_path
+
+    return (
+        Path(db_storage_path()),
+        Path.home() / ".crewai" / "memory",
+        MEMORY_DIR,
+    )
+
+
+def get_long_term_memory():
+    """Long-term memory stored under MEMORY_DIR (a new handle per crew, one shared file)."""
+    from crewai.memory import LongTermMemory
+    from crewai.memory.storage.ltm_sqlite_storage import LTMSQLiteStorage
+
+    return LongTermMemory(
+        storage=LTMSQLiteStorage(db_path=str(MEMORY_DIR / "long_term_memory_storage.db"))
+    )
+
+
+def enable_wal_on_memory_dbs():
+    """
+    Switch existing SQLite memory files to WAL journaling.
+
+    With WAL a memory write appends to the log instead of syncing a rollback
+    journal plus the database file. journal_mode is stored in the file, so
+    the connections CrewAI opens later keep it; files first created during
+    this run are converted on the next start.
+    """
+    for directory in memory_db_dirs():
+        if not directory.is_dir():
+            continue
+        for db_file in directory.rglob("*.db"):
+            with contextlib.closing(sqlite3.connect(db_file)) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+
+
+# Prompt text (dedented once at import). Both sessions run the same agent
+# (same system prompt) and open with the same preamble, so their prompts
+# share a prefix the provider can cache.
+SESSION_PREAMBLE = "This is one session of a multi-session long-term memory exercise.\n\n"
+
+LEARNING_DESCRIPTION = SESSION_PREAMBLE + dedent("""\
+    Learn and commit to long-term memory:
+
+    Company Profile - TechCorp Inc:
+    - Founded: 2015
+    - CEO: Michael Roberts
+    - Headquarters: San Francisco
+    - Revenue: $500 million
+    - Employees: 2,500
+    - Main Product: CloudSync Platform
+    - Stock Symbol: TECH
+
+    User Preferences:
+    - Preferred name: Alex
+    - Communication style: Formal
+    - Time zone: Pacific (PST)
+    - Interests: AI, Machine Learning, Startups
+
+    Confirm that all information has been stored in long-term memory.""").strip()
+
+RECALL_DESCRIPTION = SESSION_PREAMBLE + dedent("""\
+    From your long-term memory, please answer:
+
+    1. What company did we discuss? What is their stock symbol?
+    2. Who is the CEO?
+    3. What is the user's preferred name?
+    4. What are the user's interests?
+
+    If you cannot recall something, say "Not in memory".
+    This tests if long-term memory persists across sessions.""").strip()
+
+ENTITY_CONVERSATION = dedent("""\
+    I just met with John Smith from Acme Corp. He mentioned that
+    their competitor, GlobalTech, is launching a new product called
+    SmartWidget. John is interested in our AI solution and wants
+    to set up a demo next week. He reports to Lisa Wang, the CTO.""").strip()
+
+ENTITY_DESCRIPTION = (
+    "Process this conversation and track all entities:\n\n"
+    f'"{ENTITY_CONVERSATION}"\n\n'
+    "List all entities identified and what you learned about each."
+)
+
+# {sentence} is filled from the kickoff inputs of each shard
+ENTITY_SHARD_DESCRIPTION = dedent("""\
+    Track the entities (people, companies, products) mentioned in this
+    sentence from a conversation:
+
+    "{sentence}"
+
+    For each entity, list what the sentence says about it.""").strip()
+
+
+class EntityFacts(BaseModel):
+    """What one sentence says about one entity."""
+
+    name: str = Field(..., description="Entity name, e.g. 'John Smith' or 'Acme Corp'")
+    facts: list[str] = Field(default_factory=list, description="Facts stated about the entity")
+
+
+class EntityShard(BaseModel):
+    """Structured output of one entity shard."""
+
+    entities: list[EntityFacts] = Field(default_factory=list)
+
+
+# Upper bound on concurrent shard kickoffs (keep under the provider's rate limit)
+ENTITY_SHARD_CONCURRENCY = 4
+
+
+def _iter_files(root):
+    """Yield the files under root depth-first, scanning directories lazily."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
 def check_memory_storage():
     """Check what's stored in memory."""
     print("\n[Memory Storage Check]")
@@ -42,14 +177,41 @@ def check_memory_storage():
         if loc.exists():
             print(f"Found: {loc}")
             if loc.is_dir():
-                files = list(loc.rglob("*"))[:10]
-                for f in files:
-                    if f.is_file():
-                        print(f"  - {f.relative_to(loc)} ({f.stat().st_size} bytes)")
+                for entry in itertools.islice(_iter_files(loc), 10):
+                    size = entry.stat(follow_symlinks=False).st_size
+                    print(f"  - {os.path.relpath(entry.path, loc)} ({size} bytes)")
+
+
+def build_memory_assistant():
+    """
+    The agent both sessions run on.
+
+    Session 2 must meet the same agent that learned in Session 1, and an
+    identical role/goal/backstory also gives both sessions the same system
+    prompt, i.e. a shared prompt prefix.
+    """
+    from crewai import Agent
+
+    from _common import VERBOSE, default_llm
+
+    return Agent(
+        role="Long-term Memory Assistant",
+        goal="Learn information and recall it across sessions",
+        backstory="""You have an excellent long-term memory.
+        Information you learn is remembered forever and can be
+        recalled in future conversations.""",
+        llm=default_llm(),
+        verbose=VERBOSE,
+        memory=True,
+    )
 
 
 def run_session_1():
     """First session: Teach the agent new information."""
+    from crewai import Task, Crew
+
+    from _common import LOCAL_EMBEDDER, VERBOSE
+
     print("=" * 60)
     print("Long-term Memory: Session 1 (Teaching)")
     print("=" * 60)
@@ -59,36 +221,11 @@ be remembered in the next session.
 """)
 
     # Agent with long-term memory
-    learner = Agent(
-        role="Long-term Memory Assistant",
-        goal="Learn and remember information across sessions",
-        backstory="""You have an excellent long-term memory.
-        Information you learn is remembered forever and can be
-        recalled in future conversations.""",
-        verbose=True,
-        memory=True,
-    )
+    learner = build_memory_assistant()
 
     # Task to learn new information
     learning_task = Task(
-        description="""Learn and commit to long-term memory:
-
-        Company Profile - TechCorp Inc:
-        - Founded: 2015
-        - CEO: Michael Roberts
-        - Headquarters: San Francisco
-        - Revenue: $500 million
-        - Employees: 2,500
-        - Main Product: CloudSync Platform
-        - Stock Symbol: TECH
-
-        User Preferences:
-        - Preferred name: Alex
-        - Communication style: Formal
-        - Time zone: Pacific (PST)
-        - Interests: AI, Machine Learning, Startups
-
-        Confirm that all information has been stored in long-term memory.""",
+        description=LEARNING_DESCRIPTION,
         expected_output="Confirmation that all information is memorized",
         agent=learner,
     )
@@ -96,10 +233,11 @@ be remembered in the next session.
     crew = Crew(
         agents=[learner],
         tasks=[learning_task],
-        verbose=True,
+        verbose=VERBOSE,
         memory=True,
-        # Long-term memory configuration
-        # Note: The exact configuration may vary by CrewAI version
+        embedder=LOCAL_EMBEDDER,  # Local ONNX embeddings
+        # Long-term memory in ./db/memory: a new handle, on the same file every session reads
+        long_term_memory=get_long_term_memory(),
     )
 
     print("\nExecuting Session 1...")
@@ -120,6 +258,10 @@ be remembered in the next session.
 
 def run_session_2():
     """Second session: Test recall from long-term memory."""
+    from crewai import Task, Crew
+
+    from _common import LOCAL_EMBEDDER, VERBOSE
+
     print("=" * 60)
     print("Long-term Memory: Session 2 (Recall)")
     print("=" * 60)
@@ -128,27 +270,12 @@ In this session, we'll test if the agent can recall information
 learned in Session 1.
 """)
 
-    # Same agent configuration
-    recaller = Agent(
-        role="Long-term Memory Assistant",
-        goal="Recall information from long-term memory",
-        backstory="""You have an excellent long-term memory.
-        You can recall information learned in previous sessions.""",
-        verbose=True,
-        memory=True,
-    )
+    # Same agent configuration as Session 1
+    recaller = build_memory_assistant()
 
     # Task to recall information
     recall_task = Task(
-        description="""From your long-term memory, please answer:
-
-        1. What company did we discuss? What is their stock symbol?
-        2. Who is the CEO?
-        3. What is the user's preferred name?
-        4. What are the user's interests?
-
-        If you cannot recall something, say "Not in memory".
-        This tests if long-term memory persists across sessions.""",
+        description=RECALL_DESCRIPTION,
         expected_output="Answers to all questions from long-term memory",
         agent=recaller,
     )
@@ -156,8 +283,10 @@ learned in Session 1.
     crew = Crew(
         agents=[recaller],
         tasks=[recall_task],
-        verbose=True,
+        verbose=VERBOSE,
         memory=True,
+        embedder=LOCAL_EMBEDDER,
+        long_term_memory=get_long_term_memory(),
     )
 
     print("\nExecuting Session 2...")
@@ -173,6 +302,10 @@ learned in Session 1.
 
 def test_entity_memory():
     """Test entity-specific memory."""
+    from crewai import Agent, Task, Crew
+
+    from _common import LOCAL_EMBEDDER, VERBOSE, default_llm
+
     print("=" * 60)
     print("Entity Memory Test")
     print("=" * 60)
@@ -186,20 +319,14 @@ Entity Memory tracks information about specific entities
         goal="Track and remember information about entities",
         backstory="""You have excellent entity memory. You track
         details about people, companies, and concepts mentioned.""",
-        verbose=True,
+        llm=default_llm(),
+        verbose=VERBOSE,
         memory=True,
     )
 
     # Task with multiple entity mentions
     entity_task = Task(
-        description="""Process this conversation and track all entities:
-
-        "I just met with John Smith from Acme Corp. He mentioned that
-        their competitor, GlobalTech, is launching a new product called
-        SmartWidget. John is interested in our AI solution and wants
-        to set up a demo next week. He reports to Lisa Wang, the CTO."
-
-        List all entities identified and what you learned about each.""",
+        description=ENTITY_DESCRIPTION,
         expected_output="A list of entities and their associated information",
         agent=assistant,
     )
@@ -207,8 +334,10 @@ Entity Memory tracks information about specific entities
     crew = Crew(
         agents=[assistant],
         tasks=[entity_task],
-        verbose=True,
+        verbose=VERBOSE,
         memory=True,
+        embedder=LOCAL_EMBEDDER,
+        long_term_memory=get_long_term_memory(),
     )
 
     result = crew.kickoff()
@@ -219,6 +348,85 @@ Entity Memory tracks information about specific entities
     print(result)
 
 
+def _split_sentences(text: str) -> list[str]:
+    return [s for s in re.split(r"(?<=[.!?])\s+", " ".join(text.split())) if s]
+
+
+async def _kickoff_limited(crew, semaphore, inputs=None):
+    async with semaphore:
+        return await crew.kickoff_async(inputs=inputs)
+
+
+def test_entity_memory_sharded():
+    """
+    Compare: entity extraction fanned out over the conversation's sentences.
+
+    Each sentence goes to its own one-task crew and the shards are awaited
+    together, so wall time is the slowest sentence instead of one long pass
+    over the paragraph. Each shard returns an EntityShard, and the facts are
+    merged per entity name.
+    """
+    from crewai import Agent, Task, Crew
+
+    from _common import LOCAL_EMBEDDER, VERBOSE, default_llm
+
+    print("=" * 60)
+    print("Entity Memory Test (sharded by sentence)")
+    print("=" * 60)
+
+    sentences = _split_sentences(ENTITY_CONVERSATION)
+    crews = []
+    for _ in sentences:
+        # One agent per shard: concurrent crews must not share an Agent
+        assistant = Agent(
+            role="Entity-Aware Assistant",
+            goal="Track and remember information about entities",
+            backstory="""You have excellent entity memory. You track
+            details about people, companies, and concepts mentioned.""",
+            llm=default_llm(),
+            verbose=VERBOSE,
+            memory=True,
+        )
+        task = Task(
+            description=ENTITY_SHARD_DESCRIPTION,
+            expected_output='JSON: {"entities": [{"name": ..., "facts": [...]}]}',
+            agent=assistant,
+            output_pydantic=EntityShard,
+        )
+        crews.append(
+            Crew(
+                agents=[assistant],
+                tasks=[task],
+                verbose=VERBOSE,
+                memory=True,
+                embedder=LOCAL_EMBEDDER,
+                long_term_memory=get_long_term_memory(),
+            )
+        )
+
+    async def run_shards():
+        semaphore = asyncio.Semaphore(ENTITY_SHARD_CONCURRENCY)
+        return await asyncio.gather(
+            *(
+                _kickoff_limited(crew, semaphore, inputs={"sentence": sentence})
+                for crew, sentence in zip(crews, sentences)
+            )
+        )
+
+    entities = {}
+    for output in asyncio.run(run_shards()):
+        for entity in output.pydantic.entities:
+            entities.setdefault(entity.name, []).extend(entity.facts)
+
+    print("\n" + "=" * 60)
+    print("Entity Memory Result (merged):")
+    print("=" * 60)
+    for entity, facts in entities.items():
+        print(f"{entity}:")
+        for fact in facts:
+            print(f"  - {fact}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Long-term Memory Test")
     parser.add_argument(
@@ -232,6 +440,11 @@ def main():
         action="store_true",
         help="Run entity memory test",
     )
+    parser.add_argument(
+        "--entity-sharded",
+        action="store_true",
+        help="Run entity memory test with one crew per sentence, in parallel",
+    )
     parser.add_argument(
         "--check",
         action="store_true",
@@ -244,12 +457,20 @@ def main():
         return
 
     if args.entity:
+        enable_wal_on_memory_dbs()
         test_entity_memory()
         return
 
+    if args.entity_sharded:
+        enable_wal_on_memory_dbs()
+        test_entity_memory_sharded()
+        return
+
     if args.session == 1:
+        enable_wal_on_memory_dbs()
         run_session_1()
     elif args.session == 2:
+        enable_wal_on_memory_dbs()
         run_session_2()
     else:
         print("""
@@ -260,6 +481,7 @@ Usage:
   python 12_memory_longterm.py --session 1   # First: Teach information
   python 12_memory_longterm.py --session 2   # Second: Test recall
   python 12_memory_longterm.py --entity      # Test entity memory
+  python 12_memory_longterm.py --entity-sharded  # Same, one crew per sentence
   python 12_memory_longterm.py --check       # Check memory storage
 
 LangGraph Comparison:
@@ -14,15 +14,25 @@ LangGraph Comparison:
 """
 
 import asyncio
-import json
+import atexit
+import collections
+import os
+import queue
+import random
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import orjson
 from crewai import Agent, Task, Crew
 from crewai.tools import tool
 
+from _common import VERBOSE, cached_kickoff, default_llm
+
 
 # =============================================================================
 # Logging and Audit Setup
@@ -30,38 +40,492 @@ from crewai.tools import tool
 LOG_DIR = Path("./logs")
 LOG_DIR.mkdir(exist_ok=True)
 
+# Most entries the audit writer thread joins into one write()
+AUDIT_BATCH_SIZE = 256
+
+# Identical entries (same event type and data) logged again within this
+# window are counted instead of written; the LRU of recent entries is capped
+AUDIT_DEDUPE_WINDOW_NS = 2_000_000_000
+AUDIT_DEDUPE_MAX_KEYS = 512
+
+# audit.jsonl rolls over to audit.jsonl.1 (and .1 to .2, ...) past this
+# size; only the newest AUDIT_KEEP_SEGMENTS rolled-over files are kept
+AUDIT_MAX_BYTES = 16 * 1024 * 1024
+AUDIT_KEEP_SEGMENTS = 4
+
+# fsync="group": how long the writer waits for more log() calls to share
+# the batch's fsync once the queue is empty
+AUDIT_GROUP_COMMIT_WINDOW_S = 0.0005
+
+# Longest flush() (or a durable log()) waits for the writer thread
+AUDIT_WRITE_TIMEOUT_S = 30
+
+# Most buffers one writev() call accepts
+_IOV_MAX = os.sysconf("SC_IOV_MAX") if hasattr(os, "sysconf") else 1024
+
+# Queued by AuditLogger.close() to stop the writer thread
+_STOP = object()
+
+
+def _open_append(path: Path) -> int:
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    return os.open(path, flags, 0o644)
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _writev_all(fd: int, buffers: list[bytes]):
+    """Write all buffers with os.writev(), in IOV_MAX-sized groups, finishing short writes."""
+    if not hasattr(os, "writev"):  # Windows
+        _write_all(fd, b"".join(buffers))
+        return
+    for start in range(0, len(buffers), _IOV_MAX):
+        group = buffers[start:start + _IOV_MAX]
+        written = os.writev(fd, group)
+        if written < sum(map(len, group)):
+            _write_all(fd, b"".join(group)[written:])
+
+
+def _fadvise(f, advice: str):
+    """posix_fadvise() over the whole file, where the platform has it (not Windows/macOS)."""
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(f.fileno(), 0, 0, getattr(os, advice))
 
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _ensure_flat(data: dict[str, Any]) -> dict[str, Any]:
+    """
+    data with only scalar values: nested dicts become prefixed keys
+    ({"token_usage": {"total_tokens": 10}} -> {"token_usage_total_tokens": 10}),
+    anything else that is not a scalar (lists, objects) its str().
+    """
+    if all(type(v) in _SCALAR_TYPES for v in data.values()):
+        return data
+    flat = {}
+    for key, value in data.items():
+        if type(value) in _SCALAR_TYPES:
+            flat[key] = value
+        elif isinstance(value, dict):
+            for sub_key, sub_value in _ensure_flat(value).items():
+                flat[f"{key}_{sub_key}"] = sub_value
+        else:
+            flat[key] = str(value)
+    return flat
+
+
+_LOG_SCHEMA_TEMPLATE = """\
+def log_{event_type}(self, {args}):
+    entry = {{"ts_ns": time_ns(), "event_type": {event_type!r}, {items}}}
+    self._enqueue(entry)
+    return entry
+"""
+
+
+def log_schema(event_type: str, fields: tuple[str, ...]):
+    """
+    Class decorator adding a log_<event_type>(*fields) method to AuditLogger.
+
+    For events logged with the same keys every time: the method is generated
+    once, at class definition, and builds the entry as one dict literal from
+    positional arguments instead of merging a caller-built data dict.
+    """
+    def decorate(cls):
+        source = _LOG_SCHEMA_TEMPLATE.format(
+            event_type=event_type,
+            args=", ".join(fields),
+            items=", ".join(f"{f!r}: {f}" for f in fields),
+        )
+        namespace = {"time_ns": time.time_ns}
+        exec(source, namespace)
+        setattr(cls, f"log_{event_type}", namespace[f"log_{event_type}"])
+        return cls
+    return decorate
+
+
+@log_schema("tool_call", fields=("tool", "endpoint", "duration_ms", "status"))
 class AuditLogger:
-    """Custom audit logger for tracking crew executions."""
+    """
+    Custom audit logger for tracking crew executions.
+
+    log() only queues the entry; a background thread serializes queued
+    entries and appends them to the file in batches of up to
+    AUDIT_BATCH_SIZE, one write() per batch. A single writer keeps entries
+    in log() order. flush() waits until everything logged so far is in the
+    file. If the writer thread dies (an unserializable value, a failed
+    write or rotation), later log() and flush() calls raise RuntimeError
+    chained to the cause instead of dropping entries or waiting forever.
+    log() after close() raises RuntimeError too.
+
+    Repeats of an entry within AUDIT_DEDUPE_WINDOW_NS are collapsed: the
+    first one is written, the rest are counted and written once as a copy
+    of the last repeat with "repeated": <count> (when the window lapses,
+    the key drops out of the LRU, or on flush()).
+
+    Alongside the log the writer keeps an index (audit.idx next to
+    audit.jsonl) of "<event_type>\t<byte offset>" lines, so reads filtered
+    by event type seek straight to the matching entries.
+
+    The log is bounded: past AUDIT_MAX_BYTES the file and its index roll
+    over to numbered segments, and the oldest segment is deleted, so a
+    read covers at most AUDIT_KEEP_SEGMENTS + 1 files.
+
+    Durability is set by fsync:
+    - "never" (default): log() returns once the entry is queued; the OS
+      decides when it reaches the disk (flush(fsync=True) forces it).
+    - "group": log() returns once its entry is fsynced (or raises if the
+      writer failed or took over AUDIT_WRITE_TIMEOUT_S). The writer fsyncs
+      once per batch, after waiting AUDIT_GROUP_COMMIT_WINDOW_S for more
+      entries, so concurrent callers share one fsync.
+    - "always": as "group", but every entry gets its own fsync.
+    Only the log is synced; the index can be rebuilt from it (delete
+    audit.idx). In the durable modes pending repeats are written with
+    every batch, so collapsing only spans entries logged together.
+    """
 
-    def __init__(self, log_file: str = "audit.jsonl"):
+    def __init__(self, log_file: str = "audit.jsonl", fsync: str = "never"):
+        if fsync not in ("never", "group", "always"):
+            raise ValueError(f"fsync must be 'never', 'group' or 'always', not {fsync!r}")
         self.log_path = LOG_DIR / log_file
+        self.fsync = fsync
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Every line starts with the session id: encoded once here, and the
+        # writer only serializes the rest of each entry
+        self._line_prefix = orjson.dumps({"session_id": self.session_id})[:-1] + b","
+        # Raw O_APPEND descriptors, opened once and only written by the writer
+        # thread: orjson's bytes go to the kernel via writev, with no join
+        # into one buffer and no userspace buffer to flush
+        self._fd = _open_append(self.log_path)
+        self.index_path = self.log_path.with_suffix(".idx")
+        if not self._index_is_current():
+            self._rebuild_index()
+        self._idx_fd = _open_append(self.index_path)
+        self._closed = False
+        # Set when close() starts: the writer may already be stopping, so
+        # nothing logged after this point would be written
+        self._stopping = False
+        # Set by the writer thread if it dies; log() and flush() then raise it
+        self._error: BaseException | None = None
+        # Writer thread only: (event type, data) -> [first ts_ns, repeats, last repeat]
+        self._recent: collections.OrderedDict = collections.OrderedDict()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._drain, name="audit-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
 
     def log(self, event_type: str, data: dict[str, Any]):
-        """Log an event to the audit file."""
+        """
+        Log an event to the audit file (the writer adds session_id to the line).
+
+        Entries are flat: data values should be str, int, float, bool or
+        None. Nested dicts are spread into "<key>_<sub key>" fields, so their
+        numbers stay queryable; anything else (lists, objects) is logged as
+        its str().
+        """
         entry = {
-            "timestamp": datetime.now().isoformat(),
-            "session_id": self.session_id,
+            # Epoch nanoseconds: one clock read, no formatting on the hot path
+            # (see entry_time() for the readable form)
+            "ts_ns": time.time_ns(),
             "event_type": event_type,
-            **data,
+            **_ensure_flat(data),
         }
-        with open(self.log_path, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        self._enqueue(entry)
         return entry
 
+    def _enqueue(self, entry: dict):
+        self._raise_if_failed()
+        if self._stopping:
+            raise RuntimeError(f"audit logger for {self.log_path} is closed")
+        self._queue.put(entry)
+        if self.fsync != "never":
+            # Durable: wait for the writer to sync the batch holding the entry
+            synced = threading.Event()
+            self._queue.put(synced)
+            self._wait_written(synced)
+
+    def _drain(self):
+        try:
+            self._write_batches()
+        except BaseException as e:
+            # Surfaced to the next log()/flush() caller (see _raise_if_failed)
+            self._error = e
+            raise
+        finally:
+            # Nothing will write what is still queued: release its waiters
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise RuntimeError(f"audit writer thread failed; {self.log_path} is incomplete") from self._error
+
+    def _wait_written(self, marker: threading.Event):
+        """Wait for the writer to reach a queued marker; raise if it failed or hangs."""
+        done = marker.wait(AUDIT_WRITE_TIMEOUT_S)
+        self._raise_if_failed()
+        if not done:
+            raise TimeoutError(f"audit writer did not reach the marker in {AUDIT_WRITE_TIMEOUT_S}s")
+
+    def _write_batches(self):
+        # Bound once: the loop runs for every batch for the process's lifetime
+        get, get_nowait = self._queue.get, self._queue.get_nowait
+        dumps, option = orjson.dumps, orjson.OPT_APPEND_NEWLINE
+        fd, idx_fd = self._fd, self._idx_fd
+        prefix, prefix_len = self._line_prefix, len(self._line_prefix)
+        fsync_mode = self.fsync
+
+        while True:
+            batch = [get()]
+            window = AUDIT_GROUP_COMMIT_WINDOW_S if fsync_mode == "group" else 0
+            while len(batch) < AUDIT_BATCH_SIZE:
+                try:
+                    batch.append(get_nowait())
+                except queue.Empty:
+                    if not window:
+                        break
+                    # Group commit: one short wait for log() calls to join this fsync
+                    try:
+                        batch.append(get(timeout=window))
+                    except queue.Empty:
+                        break
+                    window = 0
+
+            try:
+                entries = self._collapse_repeats(item for item in batch if isinstance(item, dict))
+                if any(not isinstance(item, dict) for item in batch):
+                    entries += self._pop_repeats()
+                if entries:
+                    # Each line goes out as two buffers: the shared session prefix
+                    # and the entry's own serialization without its opening "{"
+                    buffers = []
+                    index = []
+                    offset = os.lseek(fd, 0, os.SEEK_END)
+                    for entry in entries:
+                        tail = dumps(entry, option=option)[1:]
+                        buffers += (prefix, tail)
+                        index.append(b"%s\t%d\n" % (entry["event_type"].encode(), offset))
+                        offset += prefix_len + len(tail)
+                    # Log first: an index line never points past the end of the log
+                    if fsync_mode == "always":
+                        for i in range(0, len(buffers), 2):
+                            _writev_all(fd, buffers[i:i + 2])
+                            os.fsync(fd)
+                    else:
+                        _writev_all(fd, buffers)
+                        if fsync_mode == "group":
+                            os.fsync(fd)
+                    _writev_all(idx_fd, index)
+                    if offset >= AUDIT_MAX_BYTES:
+                        fd, idx_fd = self._rotate()
+            finally:
+                # Markers from flush()/close(): everything queued before them is
+                # written (or, if this batch failed, _drain has recorded why)
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+            if _STOP in batch:
+                return
+
+    def _collapse_repeats(self, entries) -> list[dict]:
+        """Entries to write: first occurrences, plus summaries of lapsed repeats."""
+        recent = self._recent
+        out = []
+        for entry in entries:
+            data = {k: v for k, v in entry.items() if k != "ts_ns"}
+            key = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+            seen = recent.get(key)
+            if seen and entry["ts_ns"] - seen[0] <= AUDIT_DEDUPE_WINDOW_NS:
+                seen[1] += 1
+                seen[2] = entry
+                recent.move_to_end(key)
+                continue
+
+            if seen and seen[1]:
+                out.append({**seen[2], "repeated": seen[1]})
+            recent[key] = [entry["ts_ns"], 0, entry]
+            recent.move_to_end(key)
+            out.append(entry)
+            if len(recent) > AUDIT_DEDUPE_MAX_KEYS:
+                _, (_, repeats, last) = recent.popitem(last=False)
+                if repeats:
+                    out.append({**last, "repeated": repeats})
+        return out
+
+    def _pop_repeats(self) -> list[dict]:
+        """Summaries of all pending repeats (on flush/close), resetting the counts."""
+        out = []
+        for seen in self._recent.values():
+            if seen[1]:
+                out.append({**seen[2], "repeated": seen[1]})
+                seen[1] = 0
+        return out
+
+    def flush(self, fsync: bool = False):
+        """Wait until all logged entries are written; with fsync=True, also force them to disk."""
+        self._raise_if_failed()
+        if self._writer.is_alive():
+            written = threading.Event()
+            self._queue.put(written)
+            self._wait_written(written)
+        if fsync and not self._closed:
+            os.fsync(self._fd)
+
+    def close(self):
+        """Write out the remaining entries and close the file."""
+        self._stopping = True
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join(AUDIT_WRITE_TIMEOUT_S)
+        if not self._closed:
+            os.close(self._fd)
+            os.close(self._idx_fd)
+            self._closed = True
+
+    def _segment(self, path: Path, n: int) -> Path:
+        return path.with_name(f"{path.name}.{n}")
+
+    def _segments(self) -> list[tuple[Path, Path]]:
+        """(log, index) paths of the existing segments, oldest first."""
+        rolled = [
+            (self._segment(self.log_path, n), self._segment(self.index_path, n))
+            for n in range(AUDIT_KEEP_SEGMENTS, 0, -1)
+        ]
+        return [(log, idx) for log, idx in rolled if log.exists()] + [
+            (self.log_path, self.index_path)
+        ]
+
+    def _rotate(self):
+        """Roll the current file over to segment 1 (writer thread only); returns the new handles."""
+        os.close(self._fd)
+        os.close(self._idx_fd)
+        for path in (self.log_path, self.index_path):
+            self._segment(path, AUDIT_KEEP_SEGMENTS).unlink(missing_ok=True)
+            for n in range(AUDIT_KEEP_SEGMENTS - 1, 0, -1):
+                if self._segment(path, n).exists():
+                    self._segment(path, n).rename(self._segment(path, n + 1))
+            path.rename(self._segment(path, 1))
+        self._fd = _open_append(self.log_path)
+        self._idx_fd = _open_append(self.index_path)
+        return self._fd, self._idx_fd
+
+    def _index_is_current(self) -> bool:
+        """
+        Whether audit.idx covers exactly the current log.
+
+        The index is stale if the log was deleted or replaced under it, or if
+        a crash left index entries past the log's end or log lines unindexed:
+        its last offset must start the log's final line.
+        """
+        if not self.index_path.exists():
+            return False
+        log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        with open(self.index_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - 4096, 0))
+            tail = f.read()
+        if not tail:
+            return log_size == 0
+        if not tail.endswith(b"\n"):
+            return False
+        _, _, offset = tail[:-1].rpartition(b"\n")[2].partition(b"\t")
+        try:
+            last = int(offset)
+        except ValueError:
+            return False
+        if last >= log_size:
+            return False
+        with open(self.log_path, "rb") as f:
+            f.seek(last)
+            line = f.readline()
+        return line.endswith(b"\n") and last + len(line) == log_size
+
+    def _rebuild_index(self):
+        """Index a log written without one, or whose index is stale (see _index_is_current)."""
+        index = []
+        if self.log_path.exists():
+            with open(self.log_path, "rb") as f:
+                _fadvise(f, "POSIX_FADV_SEQUENTIAL")
+                offset = 0
+                for line in f:
+                    event_type = orjson.loads(line).get("event_type", "")
+                    index.append(b"%s\t%d\n" % (event_type.encode(), offset))
+                    offset += len(line)
+        self.index_path.write_bytes(b"".join(index))
+
+    @staticmethod
+    def _indexed_offsets(index_path: Path, event_type: str) -> list[int]:
+        key = event_type.encode() + b"\t"
+        with open(index_path, "rb") as f:
+            return [int(line[len(key):]) for line in f if line.startswith(key)]
+
+    def _iter_segment(self, log_path: Path, index_path: Path, event_type: str | None):
+        if not log_path.exists():
+            return
+
+        with open(log_path, "rb") as f:
+            if event_type is not None and index_path.exists():
+                for offset in self._indexed_offsets(index_path, event_type):
+                    f.seek(offset)
+                    yield orjson.loads(f.readline())
+                return
+
+            # Whole-file scan: ask for aggressive readahead, and drop the pages
+            # afterwards so a forensic read does not push out the page cache
+            _fadvise(f, "POSIX_FADV_SEQUENTIAL")
+            try:
+                if event_type is None:
+                    for line in f:
+                        yield orjson.loads(line)
+                    return
+
+                # Without an index: only parse lines that contain the event type
+                # as a JSON string at all (a cheap bytes search, no decoding)
+                needle = orjson.dumps(event_type)
+                for line in f:
+                    if needle in line:
+                        entry = orjson.loads(line)
+                        if entry.get("event_type") == event_type:
+                            yield entry
+            finally:
+                _fadvise(f, "POSIX_FADV_DONTNEED")
+
+    def iter_logs(self, event_type: str | None = None) -> Iterator[dict]:
+        """Yield logged entries oldest first, optionally filtered by event type."""
+        self.flush()
+        for log_path, index_path in self._segments():
+            yield from self._iter_segment(log_path, index_path, event_type)
+
+    def tail(self, n: int, event_type: str | None = None) -> list[dict]:
+        """The last n entries, reading segments newest first until n are found."""
+        self.flush()
+        found: list[dict] = []
+        for log_path, index_path in reversed(self._segments()):
+            newest = collections.deque(self._iter_segment(log_path, index_path, event_type), maxlen=n)
+            found[:0] = newest
+            if len(found) >= n:
+                break
+        return found[-n:] if n else []
+
     def get_logs(self, event_type: str | None = None) -> list[dict]:
         """Retrieve logs, optionally filtered by event type."""
-        if not self.log_path.exists():
-            return []
+        return list(self.iter_logs(event_type))
+
 
-        logs = []
-        with open(self.log_path, "r") as f:
-            for line in f:
-                entry = json.loads(line)
-                if event_type is None or entry.get("event_type") == event_type:
-                    logs.append(entry)
-        return logs
+def entry_time(entry: dict) -> str:
+    """ISO-8601 time of an audit entry (entries written before ts_ns carry "timestamp")."""
+    if "ts_ns" in entry:
+        return datetime.fromtimestamp(entry["ts_ns"] / 1e9).isoformat()
+    return entry.get("timestamp", "")
 
 
 # Global logger instance
@@ -86,16 +550,26 @@ def logged_api_call(endpoint: str) -> str:
     result = f"Response from {endpoint}: OK"
 
     # Log the call
-    audit_logger.log("tool_call", {
-        "tool": "logged_api_call",
-        "endpoint": endpoint,
-        "duration_ms": (time.time() - start_time) * 1000,
-        "status": "success",
-    })
+    audit_logger.log_tool_call(
+        "logged_api_call", endpoint, (time.time() - start_time) * 1000, "success"
+    )
 
     return result
 
 
+@tool("Unreliable Service")
+def unreliable_service(action: str) -> str:
+    """
+    A service that fails randomly.
+
+    Args:
+        action: The action to perform
+    """
+    if random.random() < 0.5:
+        raise Exception("Service temporarily unavailable")
+    return f"Action '{action}' completed successfully"
+
+
 # =============================================================================
 # 1. Token Usage and Cost Tracking
 # =============================================================================
@@ -109,7 +583,8 @@ def test_token_tracking():
         role="Token Counter",
         goal="Perform tasks while tracking token usage",
         backstory="You help track LLM costs.",
-        verbose=True,
+        llm=default_llm(),
+        verbose=VERBOSE,
     )
 
     task = Task(
@@ -121,19 +596,21 @@ def test_token_tracking():
     crew = Crew(
         agents=[agent],
         tasks=[task],
-        verbose=True,
+        verbose=VERBOSE,
     )
 
     audit_logger.log("crew_start", {"crew_id": "token_test"})
 
-    result = crew.kickoff()
+    result = cached_kickoff(crew, cache=False)  # Token usage must be from this run
 
     # Check token usage
     token_usage = getattr(result, "token_usage", None)
 
     audit_logger.log("crew_complete", {
         "crew_id": "token_test",
-        "token_usage": str(token_usage) if token_usage else "not_available",
+        # UsageMetrics is a pydantic model: its counters are logged as
+        # numeric token_usage_<counter> fields
+        "token_usage": token_usage.model_dump() if token_usage else "not_available",
     })
 
     print("\n[Token Usage Analysis]")
@@ -165,7 +642,8 @@ def test_audit_logging():
         goal="Perform tasks with full audit trail",
         backstory="Every action you take is logged.",
         tools=[logged_api_call],
-        verbose=True,
+        llm=default_llm(),
+        verbose=VERBOSE,
     )
 
     task = Task(
@@ -177,12 +655,12 @@ def test_audit_logging():
     crew = Crew(
         agents=[agent],
         tasks=[task],
-        verbose=True,
+        verbose=VERBOSE,
     )
 
     audit_logger.log("crew_start", {
         "crew_id": "audit_test",
-        "agents": ["Audited Agent"],
+        "agents": "Audited Agent",
         "task_count": 1,
     })
 
@@ -198,9 +676,8 @@ def test_audit_logging():
 
     # Display audit logs
     print("\n[Audit Log Contents]")
-    logs = audit_logger.get_logs()
-    for log in logs[-5:]:  # Last 5 entries
-        print(f"  {log['timestamp']} | {log['event_type']}: {json.dumps({k: v for k, v in log.items() if k not in ['timestamp', 'event_type', 'session_id']})}")
+    for log in audit_logger.tail(5):
+        print(f"  {entry_time(log)} | {log['event_type']}: {orjson.dumps({k: v for k, v in log.items() if k not in ['ts_ns', 'timestamp', 'event_type', 'session_id']}).decode()}")
 
     return result
 
@@ -229,7 +706,8 @@ Note: Native tracing requires CrewAI Enterprise or third-party tools.
         role="Traced Agent",
         goal="Demonstrate tracing capabilities",
         backstory="Your executions are traced.",
-        verbose=True,
+        llm=default_llm(),
+        verbose=VERBOSE,
     )
 
     task = Task(
@@ -242,7 +720,7 @@ Note: Native tracing requires CrewAI Enterprise or third-party tools.
     crew = Crew(
         agents=[agent],
         tasks=[task],
-        verbose=True,
+        verbose=VERBOSE,
         output_log_file=str(LOG_DIR / "crew_trace.log"),
     )
 
@@ -262,12 +740,17 @@ Note: Native tracing requires CrewAI Enterprise or third-party tools.
 # =============================================================================
 # 4. Parallel Execution
 # =============================================================================
-async def run_crew_async(crew_id: str, task_description: str) -> dict:
+# Upper bound on concurrent crew kickoffs (keep under the provider's rate limit)
+PARALLEL_CONCURRENCY = 3
+
+
+async def run_crew_async(crew_id: str, task_description: str, semaphore: asyncio.Semaphore) -> dict:
     """Run a crew asynchronously."""
     agent = Agent(
         role=f"Worker {crew_id}",
         goal="Complete assigned tasks efficiently",
         backstory=f"You are worker {crew_id}.",
+        llm=default_llm(),
         verbose=False,  # Reduce output for parallel runs
     )
 
@@ -283,9 +766,12 @@ async def run_crew_async(crew_id: str, task_description: str) -> dict:
         verbose=False,
     )
 
-    start_time = time.time()
-    result = crew.kickoff()
-    duration = time.time() - start_time
+    # kickoff_async runs the blocking kickoff in a worker thread, so the
+    # crews awaited together really overlap instead of taking turns
+    async with semaphore:
+        start_time = time.time()
+        result = await crew.kickoff_async()
+        duration = time.time() - start_time
 
     return {
         "crew_id": crew_id,
@@ -311,7 +797,8 @@ def test_parallel_execution():
 
     # Run crews in parallel using asyncio
     async def run_all():
-        tasks = [run_crew_async(cid, desc) for cid, desc in tasks_to_run]
+        semaphore = asyncio.Semaphore(PARALLEL_CONCURRENCY)
+        tasks = [run_crew_async(cid, desc, semaphore) for cid, desc in tasks_to_run]
         return await asyncio.gather(*tasks)
 
     results = asyncio.run(run_all())
@@ -339,25 +826,13 @@ def test_error_handling():
     print("5. Error Handling and Recovery")
     print("=" * 60)
 
-    @tool("Unreliable Service")
-    def unreliable_service(action: str) -> str:
-        """
-        A service that fails randomly.
-
-        Args:
-            action: The action to perform
-        """
-        import random
-        if random.random() < 0.5:
-            raise Exception("Service temporarily unavailable")
-        return f"Action '{action}' completed successfully"
-
     agent = Agent(
         role="Resilient Agent",
         goal="Complete tasks despite failures",
         backstory="You handle errors gracefully and retry when needed.",
         tools=[unreliable_service],
-        verbose=True,
+        llm=default_llm(),
+        verbose=VERBOSE,
         max_retry_limit=3,
     )
 
@@ -371,7 +846,7 @@ def test_error_handling():
     crew = Crew(
         agents=[agent],
         tasks=[task],
-        verbose=True,
+        verbose=VERBOSE,
     )
 
     try:
@@ -419,6 +894,10 @@ Enterprise Features (not tested):
 """)
 
 
+# Upper bound on tests running at once (each makes its own LLM calls)
+TEST_CONCURRENCY = 3
+
+
 def main():
     print("=" * 60)
     print("Production Concerns Verification")
@@ -444,22 +923,30 @@ features with CrewAI.
         ("Error Handling", test_error_handling),
     ]
 
-    for test_name, test_func in tests:
-        try:
-            test_func()
-        except Exception as e:
-            print(f"\n[{test_name} Failed]: {e}")
-            audit_logger.log("test_error", {
-                "test": test_name,
-                "error": str(e),
-            })
+    # The tests run side by side; their console output interleaves. Each
+    # builds its own agents, and default_llm() returns a new LLM per agent,
+    # so token counts (kept on the LLM) stay per test: test_token_tracking
+    # reports only its own crew. What they do share is audit_logger, whose
+    # log() just queues for the writer thread.
+    with ThreadPoolExecutor(max_workers=TEST_CONCURRENCY) as executor:
+        futures = {executor.submit(test_func): test_name for test_name, test_func in tests}
+        for future in as_completed(futures):
+            test_name = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                print(f"\n[{test_name} Failed]: {e}")
+                audit_logger.log("test_error", {
+                    "test": test_name,
+                    "error": str(e),
+                })
 
     # Print summary
     print_production_summary()
 
     # Show final audit log stats
-    logs = audit_logger.get_logs()
-    print(f"\nTotal audit log entries: {len(logs)}")
+    entry_count = sum(1 for _ in audit_logger.iter_logs())
+    print(f"\nTotal audit log entries: {entry_count}")
     print(f"Log file: {audit_logger.log_path}")
 
 
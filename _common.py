@@ -0,0 +1,323 @@
+"""
+_common.py - Shared helpers for the numbered examples
+
+Not an example itself: holds the small pieces of plumbing that several
+scripts need, so that each example can stay focused on the CrewAI feature
+it verifies.
+"""
+
+import contextlib
+import functools
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import ClassVar
+
+from crewai import LLM, Crew
+from crewai.crews.crew_output import CrewOutput
+from crewai.tools import BaseTool
+from pydantic import BaseModel
+
+
+# =============================================================================
+# LLM configuration
+# =============================================================================
+DEFAULT_MODEL = os.getenv("MODEL", "gpt-4o-mini")
+
+
+def default_llm() -> LLM:
+    """
+    LLM for one example agent, configured for prompt prefix caching.
+
+    A new instance per call: CrewAI keeps token counts on the LLM object and
+    sums them per agent, so a shared instance would count every agent's (and
+    every earlier crew's) usage into each crew's token_usage. Prefix caching
+    only needs identical prompt bytes, not a shared object.
+
+    OpenAI caches identical prompt prefixes automatically; Anthropic needs the
+    static blocks (system prompt built from role/goal/backstory and the tool
+    schemas) marked with cache_control. Either way the prefix must be
+    byte-for-byte stable between turns, so keep tool lists sorted
+    (see sorted_tools) and put dynamic text in the task description only.
+
+    temperature=0 makes repeated runs give the same answer, which is what
+    lets cached_kickoff() replay a stored response.
+    """
+    if "claude" in DEFAULT_MODEL:
+        return LLM(
+            model=DEFAULT_MODEL,
+            temperature=0,
+            cache_control_injection_points=[{"location": "message", "role": "system"}],
+        )
+    return LLM(model=DEFAULT_MODEL, temperature=0)
+
+
+@functools.cache
+def _encoding():
+    import tiktoken  # Only the scripts that count tokens pay for loading it
+
+    return tiktoken.encoding_for_model("gpt-4o")
+
+
+@functools.lru_cache(maxsize=256)
+def count_tokens(text: str) -> int:
+    """
+    Token count of a prompt string (gpt-4o encoding), computed once per string.
+
+    Handy for checking that a static prompt prefix is long enough for the
+    provider's prompt cache (OpenAI caches from 1024 tokens).
+    """
+    return len(_encoding().encode(text))
+
+
+def sorted_tools(*tools):
+    """Return tools ordered by name so the tool prompt prefix is deterministic."""
+    return sorted(tools, key=lambda t: t.name)
+
+
+# =============================================================================
+# Memory
+# =============================================================================
+# Embedder for memory=True crews: chromadb's ONNX all-MiniLM-L6-v2 running on
+# onnxruntime (both pulled in by crewai), so memory reads and writes embed
+# locally instead of making an embeddings API call each time.
+LOCAL_EMBEDDER = {"provider": "onnx", "config": {}}
+
+
+# =============================================================================
+# Tools
+# =============================================================================
+class SchemaCachedTool(BaseTool):
+    """BaseTool whose args_schema JSON is rendered once, when the subclass is defined."""
+
+    # args_schema as JSON with sorted keys (stable for prompt caching)
+    cached_schema: ClassVar[str | None] = None
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+        # Tools are created and discarded per run; the schema only depends on
+        # the class, so pay for model_json_schema() once at import
+        args_schema = cls.model_fields["args_schema"].default
+        if isinstance(args_schema, type) and issubclass(args_schema, BaseModel):
+            cls.cached_schema = json.dumps(args_schema.model_json_schema(), sort_keys=True)
+
+
+# =============================================================================
+# Kickoff response cache
+# =============================================================================
+CACHE_DB_PATH = Path("./db/kickoff_cache.db")
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+@contextlib.contextmanager
+def _cache_db():
+    CACHE_DB_PATH.parent.mkdir(exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB_PATH)
+    try:
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kickoff_cache "
+                "(key TEXT PRIMARY KEY, output BLOB, expires_at REAL)"
+            )
+            yield conn
+    finally:
+        conn.close()
+
+
+def _is_cacheable(crew: Crew) -> bool:
+    """A crew is only replayable if nothing outside its definition shapes the output."""
+    if crew.memory:
+        return False  # Output depends on what earlier runs stored
+    if any(task.human_input for task in crew.tasks):
+        return False  # Output depends on the human's feedback
+    # Only temperature=0 repeats: > 0 samples on purpose, and unset (None)
+    # means the provider's default, which is not 0 either
+    llms = [agent.llm for agent in crew.agents]
+    if crew.manager_llm is not None:
+        llms.append(crew.manager_llm)
+    return all(getattr(llm, "temperature", None) == 0 for llm in llms)
+
+
+def _kickoff_key(crew: Crew, inputs: dict | None) -> str:
+    payload = {
+        "agents": [
+            (
+                agent.role,
+                agent.goal,
+                agent.backstory,
+                sorted(t.name for t in agent.tools or []),
+                getattr(agent.llm, "model", str(agent.llm)),
+                agent.allow_delegation,
+            )
+            for agent in crew.agents
+        ],
+        "process": str(crew.process),
+        "manager_llm": getattr(crew.manager_llm, "model", str(crew.manager_llm)),
+        "tasks": [
+            (
+                task.description,
+                task.expected_output,
+                task.agent.role if task.agent else None,
+                # NOT_SPECIFIED (the previous task's output) as None
+                [t.description for t in task.context] if isinstance(task.context, list) else None,
+                task.async_execution,
+                task.output_pydantic.model_json_schema() if task.output_pydantic else None,
+            )
+            for task in crew.tasks
+        ],
+        "inputs": inputs or {},
+    }
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _kickoff(crew: Crew, inputs: dict | None) -> CrewOutput:
+    """crew.kickoff(), echoing the chunks as they arrive when the crew streams."""
+    if not crew.stream:
+        return crew.kickoff(inputs=inputs)
+    streaming = crew.kickoff(inputs=inputs)
+    for chunk in streaming:
+        sys.stdout.write(chunk.content)
+        sys.stdout.flush()
+    sys.stdout.write("\n")
+    return streaming.result
+
+
+def cached_kickoff(crew: Crew, inputs: dict | None = None, cache: bool = True) -> CrewOutput:
+    """
+    crew.kickoff() with a response cache keyed on the crew definition.
+
+    Task descriptions in the examples are fixed strings, so a rerun with the
+    same agents, tasks, tools, model and inputs returns the stored CrewOutput
+    from ./db/kickoff_cache.db instead of paying for the LLM calls again.
+    Crews with memory, human_input tasks or a temperature other than 0 always
+    run, and so does any crew passed with cache=False: use it when the run
+    itself is what is being shown (tool calls, timings, token usage), since a
+    replay executes no tools and reports the stored run's figures.
+    Streaming crews (stream=True) print their output as it is generated.
+    """
+    if not cache or not _is_cacheable(crew):
+        return _kickoff(crew, inputs)
+
+    key = _kickoff_key(crew, inputs)
+    with _cache_db() as conn:
+        row = conn.execute(
+            "SELECT output, expires_at FROM kickoff_cache WHERE key = ?", (key,)
+        ).fetchone()
+    if row and row[1] > time.time():
+        return pickle.loads(row[0])
+
+    result = _kickoff(crew, inputs)
+    with _cache_db() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO kickoff_cache VALUES (?, ?, ?)",
+            (key, pickle.dumps(result), time.time() + CACHE_TTL_SECONDS),
+        )
+    return result
+
+
+def cache_augmented_kickoff(crew: Crew, tool_calls) -> CrewOutput | str:
+    """
+    Answer the crew's last task from pre-executed tool results in one LLM call.
+
+    tool_calls is a list of (tool, kwargs) pairs covering everything the
+    crew's tasks would ask the tools for. The example tools memoize their
+    results, so running them directly is cheap; their outputs go into a single
+    "Tool results / Task" prompt for the last task's agent instead of a ReAct
+    loop per task. Falls back to cached_kickoff() when a planned tool is not
+    assigned to any agent of the crew.
+    """
+    available = {t.name for agent in crew.agents for t in agent.tools or []}
+    if any(t.name not in available for t, _ in tool_calls):
+        return cached_kickoff(crew)
+
+    results = "\n".join(f"- {t.name}: {t.run(**kwargs)}" for t, kwargs in tool_calls)
+    task = crew.tasks[-1]
+    agent = task.agent
+    messages = [
+        {
+            "role": "system",
+            "content": f"You are {agent.role}. {agent.backstory}\nYour goal: {agent.goal}",
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Tool results:\n{results}\n\nTask: {task.description}\n\n"
+                f"Expected output: {task.expected_output}"
+            ),
+        },
+    ]
+    return agent.llm.call(messages)
+
+
+# =============================================================================
+# Output
+# =============================================================================
+# CrewAI's verbose trace (every thought, tool call and answer) for the agents
+# and crews of 09-13; off unless CREW_VERBOSE=1
+VERBOSE = os.getenv("CREW_VERBOSE", "0") == "1"
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that leaves flushing to the stream's own buffer."""
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+def get_logger() -> logging.Logger:
+    """
+    Logger for the examples' console output (bare messages on stdout).
+
+    Unlike print() on a terminal, records are not flushed line by line:
+    stdout is switched to block buffering and written out in chunks.
+    input() flushes stdout before prompting, so HITL prompts still appear.
+    """
+    logger = logging.getLogger("crewai_examples")
+    if not logger.handlers:
+        sys.stdout.reconfigure(line_buffering=False)
+        handler = _BufferedStreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message"}
+
+
+class _JSONFormatter(logging.Formatter):
+    """One JSON object per record: {"event": <msg>, **extra}."""
+
+    def format(self, record):
+        fields = {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS}
+        return json.dumps({"event": record.getMessage(), **fields}, default=str)
+
+
+def get_event_logger() -> logging.Logger:
+    """
+    Logger for structured step/phase events, one JSON line per event.
+
+    Usage: log.info("phase.started", extra={"phase": 1, "flow_id": ...}).
+    Shares stdout and its buffering with get_logger().
+    """
+    logger = logging.getLogger("crewai_examples.events")
+    if not logger.handlers:
+        get_logger()  # Sets up stdout buffering
+        handler = _BufferedStreamHandler(sys.stdout)
+        handler.setFormatter(_JSONFormatter())
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger